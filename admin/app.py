@@ -2,6 +2,7 @@
 Interface admin Flask pour gerer les prix et les overrides.
 """
 
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
 import re
@@ -1408,9 +1409,9 @@ def create_app() -> Flask:
                 flash("Batch non trouve", "error")
                 return redirect(url_for("batches"))
 
-            results = batch.get_results()
+            columns = batch.get_results_columns()
 
-            if not results:
+            if not columns.get('status'):
                 flash("Aucun resultat disponible pour ce batch (batch ancien ou sans donnees)", "warning")
                 return redirect(url_for("batches"))
 
@@ -1420,16 +1421,15 @@ def create_app() -> Flask:
             # Header
             writer.writerow(['tcgdex_id', 'name', 'set_id', 'set_name', 'status', 'error'])
 
-            # Donnees
-            for result in results:
-                writer.writerow([
-                    result.get('tcgdex_id', ''),
-                    result.get('name', ''),
-                    result.get('set_id', ''),
-                    result.get('set_name', ''),
-                    result.get('status', ''),
-                    result.get('error', '') or '',
-                ])
+            # Donnees (colonnes zippees: None est ecrit comme une cellule vide)
+            writer.writerows(zip(
+                columns['tcgdex_id'],
+                columns['name'],
+                columns['set_id'],
+                columns['set_name'],
+                columns['status'],
+                columns['error'],
+            ))
 
             output.seek(0)
             csv_content = '\ufeff' + output.getvalue()
@@ -1954,8 +1954,8 @@ def create_app() -> Flask:
             excluded.append(serie_id)
             is_visible = False
 
-        # Mettre a jour la config
-        config.tcgdex.excluded_series = excluded
+        # Mettre a jour la config (figee: on en derive une copie)
+        config = replace(config, tcgdex=replace(config.tcgdex, excluded_series=excluded))
 
         # Sauvegarder dans config.yaml
         config.save(Path("config.yaml"))
@@ -2042,8 +2042,8 @@ def create_app() -> Flask:
             excluded.append(set_id)
             is_visible = False
 
-        # Mettre a jour la config
-        config.tcgdex.excluded_sets = excluded
+        # Mettre a jour la config (figee: on en derive une copie)
+        config = replace(config, tcgdex=replace(config.tcgdex, excluded_sets=excluded))
 
         # Sauvegarder dans config.yaml
         config.save(Path("config.yaml"))
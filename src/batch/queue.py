@@ -18,12 +18,24 @@ class QueueItemStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+# Codes entiers des statuts (stockage interne, comparaisons rapides dans les filtres)
+_PENDING, _RUNNING, _COMPLETED, _FAILED, _CANCELLED = range(5)
+_STATUS_BY_CODE = (
+    QueueItemStatus.PENDING,
+    QueueItemStatus.RUNNING,
+    QueueItemStatus.COMPLETED,
+    QueueItemStatus.FAILED,
+    QueueItemStatus.CANCELLED,
+)
+_CODE_BY_STATUS = {status: code for code, status in enumerate(_STATUS_BY_CODE)}
+
+
+@dataclass(slots=True)
 class QueueItem:
     """Element de la queue."""
     set_id: str
     set_name: str
-    status: QueueItemStatus = QueueItemStatus.PENDING
+    status_code: int = _PENDING
     added_at: datetime = field(default_factory=datetime.utcnow)
     started_at: Optional[datetime] = None
     finished_at: Optional[datetime] = None
@@ -32,6 +44,15 @@ class QueueItem:
     cards_failed: int = 0
     error: Optional[str] = None
 
+    @property
+    def status(self) -> QueueItemStatus:
+        """Statut sous forme d'enum (pour l'API)."""
+        return _STATUS_BY_CODE[self.status_code]
+
+    @status.setter
+    def status(self, value: QueueItemStatus) -> None:
+        self.status_code = _CODE_BY_STATUS[value]
+
 
 class BatchQueue:
     """
@@ -61,6 +82,7 @@ class BatchQueue:
         self._max_workers: int = 1
         self._stop_requested = threading.Event()
         self._queue_lock = threading.Lock()
+        self._dispatcher_live = False  # True tant que le dispatcher tourne
         self._initialized = True
 
     def set_max_workers(self, max_workers: int) -> None:
@@ -77,7 +99,7 @@ class BatchQueue:
         with self._queue_lock:
             # Verifier si deja dans la queue
             for item in self._queue:
-                if item.set_id == set_id and item.status == QueueItemStatus.PENDING:
+                if item.set_id == set_id and item.status_code == _PENDING:
                     return item  # Deja en attente
 
             item = QueueItem(set_id=set_id, set_name=set_name)
@@ -100,10 +122,10 @@ class BatchQueue:
     def get_status(self) -> dict:
         """Retourne le statut de la queue."""
         with self._queue_lock:
-            pending = [i for i in self._queue if i.status == QueueItemStatus.PENDING]
-            running = [i for i in self._queue if i.status == QueueItemStatus.RUNNING]
-            completed = [i for i in self._queue if i.status == QueueItemStatus.COMPLETED]
-            failed = [i for i in self._queue if i.status == QueueItemStatus.FAILED]
+            pending = [i for i in self._queue if i.status_code == _PENDING]
+            running = [i for i in self._queue if i.status_code == _RUNNING]
+            completed = [i for i in self._queue if i.status_code == _COMPLETED]
+            failed = [i for i in self._queue if i.status_code == _FAILED]
 
         return {
             "running": len(running) > 0,
@@ -135,6 +157,12 @@ class BatchQueue:
     def stop(self):
         """Demande l'arret de la queue."""
         self._stop_requested.set()
+        # Annuler tout de suite les items en attente: ceux ajoutes apres
+        # l'arret restent PENDING et seront repris par un nouveau dispatcher
+        with self._queue_lock:
+            for item in self._queue:
+                if item.status_code == _PENDING:
+                    item.status_code = _CANCELLED
         # Arreter aussi le batch en cours
         from .runner import request_stop
         request_stop()
@@ -147,69 +175,91 @@ class BatchQueue:
     def clear_pending(self):
         """Supprime les items en attente."""
         with self._queue_lock:
-            self._queue = [i for i in self._queue if i.status != QueueItemStatus.PENDING]
+            self._queue = [i for i in self._queue if i.status_code != _PENDING]
 
     def clear_completed(self):
         """Supprime les items termines de la liste."""
         with self._queue_lock:
             self._queue = [i for i in self._queue
-                           if i.status not in (QueueItemStatus.COMPLETED, QueueItemStatus.FAILED, QueueItemStatus.CANCELLED)]
+                           if i.status_code not in (_COMPLETED, _FAILED, _CANCELLED)]
 
     def _ensure_workers_running(self):
         """Demarre le pool de workers s'il n'est pas deja actif."""
-        if self._executor is not None:
+        # Chemin rapide sans verrou: le dispatcher tourne deja
+        if self._dispatcher_live:
             return
 
+        with self._queue_lock:
+            if self._dispatcher_live:
+                return
+            self._dispatcher_live = True
+
         self._stop_requested.clear()
-        self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        self._executor = executor
 
         # Lancer le dispatcher dans un thread separe
-        dispatcher_thread = threading.Thread(target=self._dispatcher_loop, daemon=True)
+        dispatcher_thread = threading.Thread(target=self._dispatcher_loop, args=(executor,), daemon=True)
         dispatcher_thread.start()
 
-    def _dispatcher_loop(self):
+    def _dispatcher_loop(self, executor: ThreadPoolExecutor):
         """Dispatcher qui soumet les items aux workers."""
         import time
 
-        while not self._stop_requested.is_set():
-            # Compter les items en cours
-            with self._queue_lock:
-                running_count = sum(1 for i in self._queue if i.status == QueueItemStatus.RUNNING)
-                pending_items = [i for i in self._queue if i.status == QueueItemStatus.PENDING]
-
-            # Si on peut lancer plus de workers
-            slots_available = self._max_workers - running_count
-
-            if slots_available > 0 and pending_items:
-                # Lancer autant de workers que possible
-                for item in pending_items[:slots_available]:
-                    with self._queue_lock:
-                        if item.status == QueueItemStatus.PENDING:
-                            item.status = QueueItemStatus.RUNNING
-                            item.started_at = datetime.utcnow()
-                            self._executor.submit(self._process_item, item)
-
-            # Verifier si tout est termine
-            with self._queue_lock:
-                has_work = any(i.status in (QueueItemStatus.PENDING, QueueItemStatus.RUNNING) for i in self._queue)
-
-            if not has_work:
-                break
-
-            # Attendre un peu avant de recheck
-            time.sleep(0.5)
-
-        # Cleanup executor
-        if self._executor:
-            self._executor.shutdown(wait=True)
-            self._executor = None
+        released = False
+        try:
+            while not self._stop_requested.is_set():
+                # Compter les items en cours
+                with self._queue_lock:
+                    running_count = sum(1 for i in self._queue if i.status_code == _RUNNING)
+                    pending_items = [i for i in self._queue if i.status_code == _PENDING]
+
+                # Si on peut lancer plus de workers
+                slots_available = self._max_workers - running_count
+
+                if slots_available > 0 and pending_items:
+                    # Lancer autant de workers que possible
+                    for item in pending_items[:slots_available]:
+                        with self._queue_lock:
+                            if item.status_code == _PENDING:
+                                item.status_code = _RUNNING
+                                item.started_at = datetime.utcnow()
+                                executor.submit(self._process_item, item)
+
+                # Verifier si tout est termine
+                with self._queue_lock:
+                    has_work = any(i.status_code in (_PENDING, _RUNNING) for i in self._queue)
+                    if not has_work:
+                        # Liberer le flag sous verrou: un add() concurrent relancera un dispatcher
+                        self._dispatcher_live = False
+                        released = True
+
+                if released:
+                    break
+
+                # Attendre un peu avant de recheck
+                time.sleep(0.5)
+
+            restart = False
+            if not released:
+                # Arret demande: liberer le flag avant d'attendre les workers.
+                # Les items encore PENDING ont ete ajoutes apres stop() (qui a
+                # annule les precedents): un nouveau dispatcher les prend
+                with self._queue_lock:
+                    self._dispatcher_live = False
+                    released = True
+                    restart = any(i.status_code == _PENDING for i in self._queue)
+            if restart:
+                self._ensure_workers_running()
+
+            # Cleanup executor
+            executor.shutdown(wait=True)
+            if self._executor is executor:
+                self._executor = None
 
-        # Marquer les items restants comme annules si arret demande
-        if self._stop_requested.is_set():
-            with self._queue_lock:
-                for item in self._queue:
-                    if item.status == QueueItemStatus.PENDING:
-                        item.status = QueueItemStatus.CANCELLED
+        finally:
+            if not released:
+                self._dispatcher_live = False
 
     def _process_item(self, item: QueueItem):
         """Traite un item dans un thread du pool."""
@@ -237,13 +287,13 @@ class BatchQueue:
 
             # Marquer comme echoue si arrete pour echecs consecutifs
             if stats.stopped_consecutive_failures:
-                item.status = QueueItemStatus.FAILED
+                item.status_code = _FAILED
                 item.error = "10 echecs consecutifs"
             else:
-                item.status = QueueItemStatus.COMPLETED
+                item.status_code = _COMPLETED
 
         except Exception as e:
-            item.status = QueueItemStatus.FAILED
+            item.status_code = _FAILED
             item.error = str(e)
 
         finally:
@@ -6,11 +6,16 @@ Pipeline complet: collecte eBay -> garde-fous -> calcul prix -> sauvegarde
 from dataclasses import dataclass, field
 from datetime import datetime, date
 from typing import Optional, Callable
+import signal
 import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from rich.console import Console
 from rich.progress import Progress, TaskID, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
 
+from sqlalchemy import insert, select, update, values, column, func, case, literal, or_, Date, DateTime, String
 from sqlalchemy.orm import Session
 
 from ..models import Card, Set, MarketSnapshot, BatchRun, BatchMode, AnchorSource, ApiUsage, Variant, Settings
@@ -18,6 +23,7 @@ from ..database import get_session, get_db_session
 from ..config import get_config
 from ..ebay import EbayQueryBuilder, EbayWorker
 from ..ebay.client import EbayRateLimitError
+from ..ebay.worker import CollectionResult
 from ..ebay.usage_tracker import (
     EbayUsageTracker, set_rate_limited, is_rate_limited,
     refresh_rate_limits_from_ebay, get_ebay_remaining, get_ebay_rate_limit_info
@@ -30,10 +36,22 @@ console = Console()
 # Flag global pour l'arret du batch (partage entre threads)
 _stop_requested = threading.Event()
 
+# Pools de collecte eBay des batchs en cours (annules par request_stop)
+_active_executors: set[ThreadPoolExecutor] = set()
+_active_executors_lock = threading.Lock()
+
 
 def request_stop():
-    """Demande l'arret du batch en cours."""
+    """Demande l'arret du batch en cours.
+
+    Les collectes eBay pas encore demarrees sont annulees immediatement;
+    le flag est verifie par la boucle aux checkpoints.
+    """
     _stop_requested.set()
+    with _active_executors_lock:
+        executors = list(_active_executors)
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
 def clear_stop():
@@ -46,7 +64,47 @@ def is_stop_requested() -> bool:
     return _stop_requested.is_set()
 
 
-@dataclass
+# Colonnes des snapshots ecrites en bulk (id et created_at sont generes a l'insertion)
+_SNAPSHOT_COLUMNS = tuple(
+    col.key for col in MarketSnapshot.__table__.columns if col.key not in ("id", "created_at")
+)
+
+
+# Au-dela de ce nombre de valeurs, une exclusion passe par une anti-jointure
+# sur une CTE VALUES plutot que par un NOT IN
+EXCLUSION_VALUES_THRESHOLD = 50
+
+
+def _exclude(query, col, excluded: list[str], name: str):
+    """Exclut les lignes dont col figure dans excluded."""
+    if len(excluded) <= EXCLUSION_VALUES_THRESHOLD:
+        return query.filter(~col.in_(excluded))
+    excluded_cte = values(column("value", String), name=name).data(
+        [(value,) for value in excluded]
+    ).cte(name)
+    return query.outerjoin(excluded_cte, col == excluded_cte.c.value).filter(
+        excluded_cte.c.value.is_(None),
+        col.isnot(None),  # Meme resultat que NOT IN pour les valeurs NULL
+    )
+
+
+def _record(results: dict[str, list], card: Card, status: str, error: Optional[str] = None) -> None:
+    """Ajoute le resultat d'une carte aux colonnes de resultats (export CSV du batch)."""
+    results["card_id"].append(card.id)
+    results["tcgdex_id"].append(card.tcgdex_id)
+    results["name"].append(card.name)
+    results["set_id"].append(card.set_id)
+    results["set_name"].append(card.set_name)
+    results["status"].append(status)
+    results["error"].append(error)
+
+
+def _snapshot_row(snapshot: MarketSnapshot) -> dict:
+    """Convertit un snapshot (non attache a la session) en ligne pour l'INSERT bulk."""
+    return {key: getattr(snapshot, key) for key in _SNAPSHOT_COLUMNS}
+
+
+@dataclass(slots=True)
 class BatchStats:
     """Statistiques du batch."""
     total_cards: int = 0
@@ -63,7 +121,7 @@ class BatchStats:
     stopped_consecutive_failures: bool = False  # Arrete pour echecs consecutifs sur un set
 
 
-@dataclass
+@dataclass(slots=True)
 class AnomalyReport:
     """Rapport d'anomalies du batch."""
     high_variations: list[dict] = field(default_factory=list)  # Variation > X% vs precedent
@@ -75,6 +133,9 @@ class AnomalyReport:
 class BatchRunner:
     """Execute le batch de pricing."""
 
+    # Echecs avant d'ignorer le reste d'un set
+    MAX_SET_FAILURES = 10
+
     def __init__(self, track_api_usage: bool = True):
         """
         Args:
@@ -87,6 +148,10 @@ class BatchRunner:
         )
         self.guardrails = PriceGuardrails()
 
+        # Seuils d'anomalies lus une fois (utilises pour chaque carte)
+        self._dispersion_bad = self.config.guardrails.dispersion_bad
+        self._variation_threshold = self.config.guardrails.variation_threshold
+
         # Tracking API usage
         self._track_api_usage = track_api_usage
         self._usage_session = None
@@ -95,21 +160,34 @@ class BatchRunner:
         # Compteur de session (basé sur eBay)
         self._starting_ebay_count = 0  # Compteur eBay au démarrage du batch
         self._session_call_count = 0   # Compteur d'appels pendant ce batch
+        self._daily_limit = 5000       # Limite configuree (relue au debut de chaque run)
+        self._api_call_lock = threading.Lock()  # Appels comptes depuis les threads de collecte
+
+        # Appels pas encore reportes en base (ecrits par paquets, voir _flush_api_usage)
+        self._pending_api_calls = 0
+        self._last_usage_flush = time.monotonic()
+
+        # Ecritures differees, envoyees en bulk a chaque checkpoint
+        self._pending_snapshots: list[dict] = []
+        self._card_updates: dict[int, dict] = {}  # card_id -> champs d'erreur
+        self._query_updates: dict[int, dict] = {}  # card_id -> requete eBay generee
 
         if track_api_usage:
             self._usage_session = get_db_session()
             # Lire la limite depuis Settings (source unique de verite)
-            daily_limit = int(Settings.get_value(self._usage_session, "daily_api_limit", "5000"))
-            self._usage_tracker = EbayUsageTracker(self._usage_session, daily_limit=daily_limit)
+            self._daily_limit = self._read_daily_limit(self._usage_session)
+            self._usage_tracker = EbayUsageTracker(self._usage_session, daily_limit=self._daily_limit)
             self.worker = EbayWorker(on_api_call=self._on_api_call)
         else:
             self.worker = EbayWorker()
 
     def _on_api_call(self, count: int = 1) -> None:
         """Callback appele apres chaque appel API."""
-        # Compteur de session uniquement en memoire (evite "database is locked")
-        self._session_call_count += count
-        # L'usage API sera mis a jour en DB a la fin du batch dans close()
+        # Compteur de session uniquement en memoire (evite "database is locked");
+        # l'usage est reporte en base par paquets aux checkpoints du batch
+        with self._api_call_lock:
+            self._session_call_count += count
+            self._pending_api_calls += count
 
     def get_api_usage_today(self) -> dict:
         """Retourne l'usage API du jour."""
@@ -118,41 +196,109 @@ class BatchRunner:
             return get_ebay_usage_summary(self._usage_session)
         return {}
 
-    def _check_api_limit(self, session: Session) -> bool:
+    @staticmethod
+    def _read_daily_limit(session: Session) -> int:
+        """Lit la limite API quotidienne configuree dans Settings."""
+        daily_limit_str = Settings.get_value(session, "daily_api_limit", "5000")
+        try:
+            return int(daily_limit_str)
+        except ValueError:
+            return 5000
+
+    def _check_api_limit(self, reserved: int = 0) -> bool:
         """Verifie si la limite API quotidienne est atteinte.
 
-        Logique: (compteur eBay initial + appels de ce batch) >= limite configuree
+        Logique: (compteur eBay initial + appels de ce batch + reserves) >= limite configuree
+        La limite est lue une fois au debut du run (self._daily_limit).
+
+        Args:
+            reserved: Appels deja engages mais pas encore comptes (collectes en cours)
 
         Returns:
             True si la limite est atteinte, False sinon.
         """
-        # Recuperer la limite configuree dans Settings
-        daily_limit_str = Settings.get_value(session, "daily_api_limit", "5000")
-        try:
-            daily_limit = int(daily_limit_str)
-        except ValueError:
-            daily_limit = 5000
+        return (self._starting_ebay_count + self._session_call_count + reserved) >= self._daily_limit
 
-        # Calcul: eBay initial + session = total utilise
-        total_count = self._starting_ebay_count + self._session_call_count
+    def _queue_card_update(
+        self,
+        card: Card,
+        last_error: Optional[str],
+        last_error_at: Optional[datetime],
+        error_count: int,
+    ) -> None:
+        """Enregistre la mise a jour des champs d'erreur d'une carte (ecrite au checkpoint)."""
+        self._card_updates[card.id] = {
+            "id": card.id,
+            "last_error": last_error,
+            "last_error_at": last_error_at,
+            "error_count": error_count,
+        }
+
+    @staticmethod
+    def _increment_card_errors(session: Session, card: Card, **values) -> None:
+        """Incremente error_count cote SQL (atomique) et met a jour les champs donnes."""
+        session.execute(
+            update(Card)
+            .where(Card.id == card.id)
+            .values(error_count=func.coalesce(Card.error_count, 0) + 1, **values)
+            .execution_options(synchronize_session=False)
+        )
 
-        if total_count >= daily_limit:
-            return True  # Limite configuree atteinte
+    def _flush_pending(self, session: Session) -> None:
+        """Ecrit les snapshots et mises a jour de cartes en attente (executemany)."""
+        if self._pending_snapshots:
+            session.execute(MarketSnapshot.__table__.insert(), self._pending_snapshots)
+            self._pending_snapshots = []
+        if self._card_updates:
+            # UPDATE groupe par cle primaire (un executemany)
+            session.execute(update(Card), list(self._card_updates.values()))
+            self._card_updates = {}
+        if self._query_updates:
+            session.execute(update(Card), list(self._query_updates.values()))
+            self._query_updates = {}
+
+    # Seuils de report de l'usage API en base
+    USAGE_FLUSH_CALLS = 100
+    USAGE_FLUSH_SECONDS = 5.0
+
+    def _flush_api_usage(self, force: bool = False) -> None:
+        """Reporte en base les appels API en attente, en une seule ecriture.
+
+        Hors force, n'ecrit que si USAGE_FLUSH_CALLS appels sont en attente ou
+        si le dernier report date de plus de USAGE_FLUSH_SECONDS. A appeler
+        depuis le thread du batch, hors transaction d'ecriture en cours
+        (session separee: evite "database is locked").
+        """
+        if not self._usage_session or not self._usage_tracker:
+            return
+
+        with self._api_call_lock:
+            pending = self._pending_api_calls
+            if pending == 0:
+                return
+            if not force and pending < self.USAGE_FLUSH_CALLS and \
+                    time.monotonic() - self._last_usage_flush < self.USAGE_FLUSH_SECONDS:
+                return
+            self._pending_api_calls = 0
 
-        return False
+        try:
+            self._usage_tracker.increment(pending)
+            self._usage_session.commit()
+        except Exception:
+            self._usage_session.rollback()
+            # Reessayer au prochain report
+            with self._api_call_lock:
+                self._pending_api_calls += pending
+        self._last_usage_flush = time.monotonic()
 
     def close(self) -> None:
-        """Ferme la session de tracking et sauvegarde l'usage API."""
-        if self._usage_session and self._usage_tracker and self._session_call_count > 0:
-            try:
-                # Mettre a jour l'usage API en une seule fois a la fin
-                self._usage_tracker.increment(self._session_call_count)
-                self._usage_session.commit()
-            except Exception:
-                pass  # Ignorer les erreurs de commit a la fermeture
+        """Ferme la session de tracking et sauvegarde l'usage API restant."""
+        # Les erreurs de commit a la fermeture sont ignorees (rollback)
+        self._flush_api_usage(force=True)
         if self._usage_session:
             self._usage_session.close()
             self._usage_session = None
+        self.worker.close()
 
     def run(
         self,
@@ -181,10 +327,15 @@ class BatchRunner:
         anomalies = AnomalyReport()
         batch_run: Optional[BatchRun] = None
 
+        # Date des snapshots et horodatage du run, fixes pour tout le batch
+        as_of = date.today()
+        run_started_at = datetime.utcnow()
+
         # Rafraichir les rate limits eBay au demarrage
         rate_limits = refresh_rate_limits_from_ebay()
 
         # Initialiser le compteur de session depuis eBay
+        self._flush_api_usage(force=True)
         self._session_call_count = 0
         if rate_limits:
             self._starting_ebay_count = rate_limits.get('count', 0)
@@ -196,12 +347,11 @@ class BatchRunner:
 
         with get_session() as session:
             # Afficher la limite configuree et le nombre d'appels possibles
-            daily_limit_str = Settings.get_value(session, "daily_api_limit", "5000")
-            daily_limit = int(daily_limit_str)
-            remaining = daily_limit - self._starting_ebay_count
-            console.print(f"[dim]Limite configurée: {daily_limit} -> {remaining} appels possibles[/dim]")
+            self._daily_limit = self._read_daily_limit(session)
+            remaining = self._daily_limit - self._starting_ebay_count
+            console.print(f"[dim]Limite configurée: {self._daily_limit} -> {remaining} appels possibles[/dim]")
             # Verifier la limite API AVANT de commencer
-            if self._check_api_limit(session):
+            if self._check_api_limit():
                 console.print("[yellow]Limite API quotidienne deja atteinte, batch non demarre[/yellow]")
                 stats.stopped_api_limit = True
                 return stats, anomalies
@@ -216,7 +366,7 @@ class BatchRunner:
             # Creer le batch run
             batch_run = BatchRun(
                 mode=mode,
-                started_at=datetime.utcnow(),
+                started_at=run_started_at,
                 set_id=set_id,
                 set_name=set_name,
                 cards_succeeded=0,
@@ -226,8 +376,9 @@ class BatchRunner:
             session.flush()
 
             # Recuperer les cartes a traiter (avec priorisation si demandee)
-            cards = self._get_cards_to_process(session, card_ids, set_id, limit, prioritize_oldest)
-            stats.total_cards = len(cards)
+            # Seuls les ids sont materialises; les cartes sont chargees par paquets
+            target_ids = self._get_card_ids_to_process(session, card_ids, set_id, limit, prioritize_oldest)
+            stats.total_cards = len(target_ids)
             batch_run.cards_targeted = stats.total_cards
             session.commit()  # Commit initial pour que le batch soit visible
 
@@ -238,139 +389,189 @@ class BatchRunner:
 
             # Reinitialiser le flag d'arret au demarrage
             clear_stop()
+            self._pending_snapshots = []
+            self._card_updates = {}
+            self._query_updates = {}
 
             # Compteur d'echecs par set (pour skip les sets problematiques)
             set_failures: dict[str, int] = {}  # set_id -> nombre d'echecs
             skipped_sets: set[str] = set()  # sets a ignorer
-            MAX_SET_FAILURES = 10
+            MAX_SET_FAILURES = self.MAX_SET_FAILURES
+
+            # Progression: au plus ~200 appels du callback par batch
+            callback_stride = max(1, stats.total_cards // 200)
 
             # Resultats detailles pour export CSV
-            card_results: list[dict] = []
+            # (une liste par champ, voir BatchRun.RESULT_COLUMNS)
+            card_results: dict[str, list] = {key: [] for key in BatchRun.RESULT_COLUMNS}
+
+            # Collecte eBay en parallele (I/O reseau) sur une fenetre bornee;
+            # les resultats sont traites sur ce thread, dans l'ordre des cartes,
+            # donc les ecritures DB et le comptage des echecs restent sequentiels
+            executor: Optional[ThreadPoolExecutor] = None
+            max_in_flight = 1
+            if mode == BatchMode.FULL_EBAY:
+                concurrency = max(1, self.config.ebay.concurrency or 8)
+                executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ebay-collect")
+                max_in_flight = concurrency * 2
+                with _active_executors_lock:
+                    _active_executors.add(executor)
+            # (carte, snapshot precedent, future de collecte ou None)
+            in_flight: deque[tuple[Card, Optional[MarketSnapshot], Optional[Future]]] = deque()
+            cards_iter = self._iter_cards(session, target_ids, as_of)
+            # Mode HYBRID: pas de collecte, traitement ensembliste (voir _run_hybrid_bulk)
+            exhausted = mode == BatchMode.HYBRID
+
+            # Les cartes sont lues par les threads de collecte: ne pas les
+            # expirer (et les recharger) aux commits intermediaires
+            session.expire_on_commit = False
+
+            # Ctrl-C (thread principal uniquement): arret propre via request_stop();
+            # un second Ctrl-C retrouve le comportement precedent
+            previous_sigint = None
+            sigint_installed = False
+            if threading.current_thread() is threading.main_thread():
+                def on_sigint(signum, frame):
+                    signal.signal(signal.SIGINT, previous_sigint or signal.default_int_handler)
+                    console.print("[yellow]Interruption demandee, arret du batch...[/yellow]")
+                    request_stop()
+
+                previous_sigint = signal.signal(signal.SIGINT, on_sigint)
+                sigint_installed = True
 
             # Traiter chaque carte avec try/finally pour garantir la finalisation
             try:
-                for i, card in enumerate(cards):
-                    # Verifier si l'arret a ete demande
-                    if is_stop_requested():
-                        console.print("[yellow]Batch interrompu par l'utilisateur[/yellow]")
+                if mode == BatchMode.HYBRID:
+                    self._run_hybrid_bulk(
+                        session, target_ids, as_of, stats, anomalies, card_results,
+                        batch_run, progress_callback
+                    )
+
+                while True:
+                    # Alimenter la fenetre de collecte
+                    while not exhausted and len(in_flight) < max_in_flight:
+                        # Verifier la limite API AVANT de lancer la carte
+                        # (chaque collecte non terminee consommera au moins un appel)
+                        running = sum(1 for _, _, f in in_flight if f is not None and not f.done())
+                        if self._check_api_limit(reserved=running):
+                            console.print("[yellow]Limite API quotidienne atteinte, arret du batch[/yellow]")
+                            stats.stopped_api_limit = True
+                            exhausted = True
+                            break
+
+                        next_item = next(cards_iter, None)
+                        if next_item is None:
+                            exhausted = True
+                            break
+
+                        card, previous_snapshot = next_item
+                        future = None
+                        # Pas de collecte pour les sets deja ignores
+                        if card.set_id not in skipped_sets:
+                            try:
+                                future = self._submit_collect(executor, card)
+                            except RuntimeError:
+                                # Pool arrete par request_stop()
+                                console.print("[yellow]Batch interrompu par l'utilisateur[/yellow]")
+                                exhausted = True
+                                break
+                        in_flight.append((card, previous_snapshot, future))
+
+                    if not in_flight:
                         break
 
-                    # Verifier la limite API quotidienne AVANT de traiter la carte
-                    if self._check_api_limit(session):
-                        console.print("[yellow]Limite API quotidienne atteinte, arret du batch[/yellow]")
-                        stats.stopped_api_limit = True
-                        break
+                    card, previous_snapshot, future = in_flight.popleft()
 
-                    # Verifier si le set de cette carte est a ignorer
-                    if card.set_id in skipped_sets:
-                        stats.skipped += 1
-                        stats.processed += 1
-                        card_results.append({
-                            "card_id": card.id,
-                            "tcgdex_id": card.tcgdex_id,
-                            "name": card.name,
-                            "set_id": card.set_id,
-                            "set_name": card.set_name,
-                            "status": "skipped",
-                            "error": f"Set {card.set_id} ignore (trop d'echecs)"
-                        })
+                    # Collecte annulee par request_stop(): carte non traitee
+                    if future is not None and future.cancelled():
+                        session.expunge(card)
                         continue
 
-                    try:
-                        result = self._process_card(session, card, mode, anomalies)
-
-                        if result == "success":
-                            stats.succeeded += 1
-                            # Reset compteur du set en cas de succes
-                            if card.set_id in set_failures:
-                                set_failures[card.set_id] = 0
-                            card_results.append({
-                                "card_id": card.id,
-                                "tcgdex_id": card.tcgdex_id,
-                                "name": card.name,
-                                "set_id": card.set_id,
-                                "set_name": card.set_name,
-                                "status": "success",
-                                "error": None
-                            })
-                        elif result == "skipped":
-                            stats.skipped += 1
-                            card_results.append({
-                                "card_id": card.id,
-                                "tcgdex_id": card.tcgdex_id,
-                                "name": card.name,
-                                "set_id": card.set_id,
-                                "set_name": card.set_name,
-                                "status": "skipped",
-                                "error": None
-                            })
-                        elif result == "failed":
+                    # Verifier si le set de cette carte est a ignorer
+                    if future is None and card.set_id in skipped_sets:
+                        stats.skipped += 1
+                        _record(card_results, card, "skipped", f"Set {card.set_id} ignore (trop d'echecs)")
+                    else:
+                        try:
+                            collected = future.result() if future is not None else None
+                            result, error = self._process_card(
+                                session, card, anomalies, as_of, run_started_at,
+                                previous_snapshot, collected
+                            )
+
+                            if result == "success":
+                                stats.succeeded += 1
+                                # Reset compteur du set en cas de succes
+                                if card.set_id in set_failures:
+                                    set_failures[card.set_id] = 0
+                                _record(card_results, card, "success")
+                            elif result == "skipped":
+                                stats.skipped += 1
+                                _record(card_results, card, "skipped")
+                            elif result == "failed":
+                                stats.failed += 1
+                                # Incrementer compteur d'echecs pour ce set
+                                set_failures[card.set_id] = set_failures.get(card.set_id, 0) + 1
+                                if set_failures[card.set_id] >= MAX_SET_FAILURES:
+                                    console.print(f"[yellow]Set {card.set_id} ignore apres {MAX_SET_FAILURES} echecs[/yellow]")
+                                    skipped_sets.add(card.set_id)
+                                    stats.skipped_sets.append(card.set_id)
+                                _record(card_results, card, "failed", error)
+
+                        except EbayRateLimitError:
+                            # Erreur 429: activer le blocage et arreter immediatement
+                            console.print("[red]Erreur 429 - Rate limit eBay atteint, arret du batch[/red]")
+                            set_rate_limited()
+                            stats.stopped_rate_limit = True
+                            _record(card_results, card, "failed", "Erreur 429 - Rate limit eBay")
+                            break
+
+                        except Exception as e:
                             stats.failed += 1
+                            stats.errors.append((card.id, str(e)))
+                            console.print(f"[red]Error processing card {card.id}: {e}[/red]")
                             # Incrementer compteur d'echecs pour ce set
                             set_failures[card.set_id] = set_failures.get(card.set_id, 0) + 1
                             if set_failures[card.set_id] >= MAX_SET_FAILURES:
                                 console.print(f"[yellow]Set {card.set_id} ignore apres {MAX_SET_FAILURES} echecs[/yellow]")
                                 skipped_sets.add(card.set_id)
                                 stats.skipped_sets.append(card.set_id)
-                            # Recuperer l'erreur depuis la carte
-                            card_results.append({
-                                "card_id": card.id,
-                                "tcgdex_id": card.tcgdex_id,
-                                "name": card.name,
-                                "set_id": card.set_id,
-                                "set_name": card.set_name,
-                                "status": "failed",
-                                "error": card.last_error
-                            })
-
-                    except EbayRateLimitError:
-                        # Erreur 429: activer le blocage et arreter immediatement
-                        console.print("[red]Erreur 429 - Rate limit eBay atteint, arret du batch[/red]")
-                        set_rate_limited()
-                        stats.stopped_rate_limit = True
-                        card_results.append({
-                            "card_id": card.id,
-                            "tcgdex_id": card.tcgdex_id,
-                            "name": card.name,
-                            "set_id": card.set_id,
-                            "set_name": card.set_name,
-                            "status": "failed",
-                            "error": "Erreur 429 - Rate limit eBay"
-                        })
-                        break
-
-                    except Exception as e:
-                        stats.failed += 1
-                        stats.errors.append((card.id, str(e)))
-                        console.print(f"[red]Error processing card {card.id}: {e}[/red]")
-                        # Incrementer compteur d'echecs pour ce set
-                        set_failures[card.set_id] = set_failures.get(card.set_id, 0) + 1
-                        if set_failures[card.set_id] >= MAX_SET_FAILURES:
-                            console.print(f"[yellow]Set {card.set_id} ignore apres {MAX_SET_FAILURES} echecs[/yellow]")
-                            skipped_sets.add(card.set_id)
-                            stats.skipped_sets.append(card.set_id)
-                        card_results.append({
-                            "card_id": card.id,
-                            "tcgdex_id": card.tcgdex_id,
-                            "name": card.name,
-                            "set_id": card.set_id,
-                            "set_name": card.set_name,
-                            "status": "failed",
-                            "error": str(e)
-                        })
+                            _record(card_results, card, "failed", str(e))
 
+                    # Carte sortie de la fenetre et traitee: la retirer de la
+                    # session pour borner l'identity map (les ecritures passent
+                    # par _flush_pending, la carte n'a rien a flusher)
+                    session.expunge(card)
                     stats.processed += 1
 
-                    # Mettre a jour les compteurs toutes les 5 cartes
-                    if stats.processed % 5 == 0 or stats.processed == stats.total_cards:
+                    # Mettre a jour les compteurs toutes les 50 cartes
+                    if stats.processed % 50 == 0 or stats.processed == stats.total_cards:
                         batch_run.cards_succeeded = stats.succeeded
                         batch_run.cards_failed = stats.failed
+                        self._flush_pending(session)
                         session.commit()
+                        # Hors transaction du batch: reporter l'usage API
+                        self._flush_api_usage()
+
+                        # Arret demande (UI, queue, Ctrl-C): verifie aux checkpoints
+                        if not exhausted and is_stop_requested():
+                            console.print("[yellow]Batch interrompu par l'utilisateur[/yellow]")
+                            exhausted = True
 
-                    if progress_callback:
+                    if progress_callback and (
+                        stats.processed % callback_stride == 0 or stats.processed == stats.total_cards
+                    ):
                         progress_callback(stats.processed, stats.total_cards, stats.succeeded, stats.failed)
 
             finally:
+                # Annuler les collectes non demarrees et attendre celles en cours
+                if executor is not None:
+                    with _active_executors_lock:
+                        _active_executors.discard(executor)
+                    executor.shutdown(wait=True, cancel_futures=True)
+                if sigint_installed:
+                    signal.signal(signal.SIGINT, previous_sigint or signal.default_int_handler)
+
                 # TOUJOURS finaliser le batch, meme en cas d'exception
                 batch_run.finished_at = datetime.utcnow()
                 batch_run.cards_succeeded = stats.succeeded
@@ -381,8 +582,9 @@ class BatchRunner:
                 batch_run.notes = report
 
                 # Sauvegarder les resultats detailles pour export CSV
-                batch_run.set_results(card_results)
+                batch_run.set_results_columns(card_results)
 
+                self._flush_pending(session)
                 session.commit()
 
         # Rafraichir les rate limits eBay a la fin du batch (verification)
@@ -403,16 +605,16 @@ class BatchRunner:
 
         return stats, anomalies
 
-    def _get_cards_to_process(
+    def _get_card_ids_to_process(
         self,
         session: Session,
         card_ids: Optional[list[int]],
         set_id: Optional[str],
         limit: Optional[int],
         prioritize_oldest: bool = False
-    ) -> list[Card]:
+    ) -> list[int]:
         """
-        Recupere les cartes a traiter avec regles de priorisation.
+        Recupere les ids des cartes a traiter avec regles de priorisation.
 
         Ordre de priorite (si prioritize_oldest=True):
         - P0: Cartes jamais parcourues (pas de snapshot) ou p50 NULL
@@ -424,11 +626,14 @@ class BatchRunner:
 
         Triees par anciennete du snapshot (plus ancien d'abord).
 
+        Chaque groupe de priorite est une requete simple (filtres sans OR
+        entre groupes, tri sur une seule colonne); les groupes sont
+        concatenes dans l'ordre, la limite etant repartie sur les suivants.
+
         Args:
             prioritize_oldest: Si True, applique les regles de priorisation
         """
-        from sqlalchemy import func, case, and_, or_
-        from sqlalchemy.orm import aliased
+        from sqlalchemy import func, and_, or_
         from datetime import timedelta
 
         # Recuperer les series/sets exclus depuis la config
@@ -436,221 +641,408 @@ class BatchRunner:
         excluded_series = config.tcgdex.excluded_series or []
         excluded_sets = config.tcgdex.excluded_sets or []
 
-        if prioritize_oldest:
-            # Recuperer les parametres de priorisation depuis Settings
-            low_value_threshold = float(Settings.get_value(session, "low_value_threshold", "10"))
-            low_value_refresh_days = int(Settings.get_value(session, "low_value_refresh_days", "60"))
-            max_error_retries = int(Settings.get_value(session, "max_error_retries", "3"))
-
-            # Subquery pour trouver le dernier snapshot de chaque carte avec anchor_price
-            latest_snapshot = session.query(
-                MarketSnapshot.card_id,
-                func.max(MarketSnapshot.as_of_date).label('last_snapshot_date')
-            ).group_by(MarketSnapshot.card_id).subquery()
-
-            # Subquery pour recuperer le p50 du dernier snapshot
-            snapshot_with_price = session.query(
-                MarketSnapshot.card_id,
-                MarketSnapshot.p50,
-                MarketSnapshot.as_of_date
-            ).join(
-                latest_snapshot,
-                and_(
-                    MarketSnapshot.card_id == latest_snapshot.c.card_id,
-                    MarketSnapshot.as_of_date == latest_snapshot.c.last_snapshot_date
-                )
-            ).subquery()
+        def base_query(*extra_columns):
+            """Cartes actives filtrees (ids, set, series/sets exclus)."""
+            query = session.query(Card.id, *extra_columns).join(Set, Card.set_id == Set.id).filter(Card.is_active == True)
+            if card_ids:
+                query = query.filter(Card.id.in_(card_ids))
+            if set_id:
+                query = query.filter(Card.set_id == set_id)
+            # Exclure les series et sets masques dans la config
+            if excluded_series:
+                query = _exclude(query, Set.serie_id, excluded_series, "excluded_series")
+            if excluded_sets:
+                query = _exclude(query, Set.id, excluded_sets, "excluded_sets")
+            return query
+
+        if not prioritize_oldest:
+            query = base_query()
+            if limit:
+                query = query.limit(limit)
+            return [card_id for (card_id,) in query]
+
+        # Recuperer les parametres de priorisation depuis Settings
+        low_value_threshold = float(Settings.get_value(session, "low_value_threshold", "10"))
+        low_value_refresh_days = int(Settings.get_value(session, "low_value_refresh_days", "60"))
+        max_error_retries = int(Settings.get_value(session, "max_error_retries", "3"))
+
+        # Subquery pour trouver la date du dernier snapshot de chaque carte
+        latest_snapshot = session.query(
+            MarketSnapshot.card_id,
+            func.max(MarketSnapshot.as_of_date).label('last_snapshot_date')
+        ).group_by(MarketSnapshot.card_id).subquery()
+
+        # Subquery pour recuperer le p50 du dernier snapshot
+        latest = session.query(
+            MarketSnapshot.card_id,
+            MarketSnapshot.p50,
+            MarketSnapshot.as_of_date
+        ).join(
+            latest_snapshot,
+            and_(
+                MarketSnapshot.card_id == latest_snapshot.c.card_id,
+                MarketSnapshot.as_of_date == latest_snapshot.c.last_snapshot_date
+            )
+        ).subquery()
+
+        # Cooldowns
+        error_cooldown = datetime.utcnow() - timedelta(hours=24)
+        low_value_cooldown = date.today() - timedelta(days=low_value_refresh_days)
+        # Cooldown pour les cartes avec trop d'erreurs (basé sur last_error_at)
+        max_error_cooldown = datetime.utcnow() - timedelta(days=low_value_refresh_days)
+
+        # Cartes deja parcourues, reessayables (peu d'erreurs, cooldown 24h OK)
+        retryable = and_(
+            Card.error_count < max_error_retries,
+            or_(Card.last_error_at.is_(None), Card.last_error_at < error_cooldown),
+        )
 
-            # Cooldowns
-            error_cooldown = datetime.utcnow() - timedelta(hours=24)
-            low_value_cooldown = date.today() - timedelta(days=low_value_refresh_days)
-            # Cooldown pour les cartes avec trop d'erreurs (basé sur last_error_at)
-            max_error_cooldown = datetime.utcnow() - timedelta(days=low_value_refresh_days)
-
-            # Construire la query avec priorites
-            # Priority 0: jamais parcourue (pas de snapshot OU p50 NULL sans erreur)
-            # Priority 1: basse valeur (p50 < seuil) avec snapshot > low_value_refresh_days
-            # Priority 2: forte valeur (p50 >= seuil) - toujours incluse, triee par anciennete
-
-            query = session.query(Card).join(
-                Set, Card.set_id == Set.id
-            ).outerjoin(
-                snapshot_with_price,
-                Card.id == snapshot_with_price.c.card_id
-            ).filter(
-                Card.is_active == True,
-            ).filter(
+        buckets = [
+            # P0: Jamais parcourue (pas de snapshot)
+            base_query().outerjoin(latest, Card.id == latest.c.card_id).filter(
+                latest.c.card_id.is_(None),
                 or_(
-                    # P0: Jamais parcourue sans erreur
-                    and_(
-                        snapshot_with_price.c.card_id.is_(None),
-                        Card.error_count == 0
-                    ),
-                    # P0: Jamais parcourue avec erreur < max + cooldown 24h OK
+                    # Sans erreur
+                    Card.error_count == 0,
+                    # Avec erreur < max + cooldown 24h OK
                     and_(
-                        snapshot_with_price.c.card_id.is_(None),
                         Card.error_count > 0,
                         Card.error_count < max_error_retries,
                         Card.last_error_at < error_cooldown
                     ),
-                    # P0: Jamais parcourue avec trop d'erreurs + cooldown 60j OK
+                    # Avec trop d'erreurs + cooldown 60j OK
                     and_(
-                        snapshot_with_price.c.card_id.is_(None),
                         Card.error_count >= max_error_retries,
                         or_(Card.last_error_at.is_(None), Card.last_error_at < max_error_cooldown)
                     ),
-                    # P0: p50 NULL sans erreur (snapshot existe mais pas de prix)
-                    and_(
-                        snapshot_with_price.c.card_id.isnot(None),
-                        snapshot_with_price.c.p50.is_(None),
-                        Card.error_count == 0
-                    ),
-                    # P1: Basse valeur avec snapshot > 60j
-                    and_(
-                        snapshot_with_price.c.card_id.isnot(None),
-                        snapshot_with_price.c.p50 < low_value_threshold,
-                        snapshot_with_price.c.as_of_date < low_value_cooldown,
-                        Card.error_count < max_error_retries,
-                        or_(Card.last_error_at.is_(None), Card.last_error_at < error_cooldown)
-                    ),
-                    # P2: Forte valeur - toujours incluse (pas de filtre date)
-                    and_(
-                        snapshot_with_price.c.card_id.isnot(None),
-                        snapshot_with_price.c.p50 >= low_value_threshold,
-                        Card.error_count < max_error_retries,
-                        or_(Card.last_error_at.is_(None), Card.last_error_at < error_cooldown)
-                    ),
-                )
-            ).order_by(
-                # Priorite: 0=jamais parcourue, 1=basse valeur, 2=forte valeur
-                case(
-                    # P0: Jamais parcouree (pas de snapshot)
-                    (snapshot_with_price.c.card_id.is_(None), 0),
-                    # P0: p50 NULL (a explorer)
-                    (snapshot_with_price.c.p50.is_(None), 0),
-                    # P1: Basse valeur
-                    (snapshot_with_price.c.p50 < low_value_threshold, 1),
-                    # P2: Forte valeur
-                    else_=2
                 ),
-                snapshot_with_price.c.as_of_date.asc().nullsfirst()  # Plus ancien d'abord
-            )
-        else:
-            query = session.query(Card).join(Set, Card.set_id == Set.id).filter(Card.is_active == True)
+            ).order_by(Card.id),
+            # P0: p50 NULL sans erreur (snapshot existe mais pas de prix)
+            base_query(latest.c.as_of_date).join(latest, Card.id == latest.c.card_id).filter(
+                latest.c.p50.is_(None),
+                Card.error_count == 0,
+            ).distinct().order_by(latest.c.as_of_date, Card.id),
+            # P1: Basse valeur avec snapshot > 60j
+            base_query(latest.c.as_of_date).join(latest, Card.id == latest.c.card_id).filter(
+                latest.c.p50 < low_value_threshold,
+                latest.c.as_of_date < low_value_cooldown,
+                retryable,
+            ).distinct().order_by(latest.c.as_of_date, Card.id),
+            # P2: Forte valeur - toujours incluse (pas de filtre date)
+            base_query(latest.c.as_of_date).join(latest, Card.id == latest.c.card_id).filter(
+                latest.c.p50 >= low_value_threshold,
+                retryable,
+            ).distinct().order_by(latest.c.as_of_date, Card.id),
+        ]
 
-        if card_ids:
-            query = query.filter(Card.id.in_(card_ids))
+        # Une carte ayant plusieurs snapshots a la derniere date peut
+        # apparaitre dans plusieurs groupes: garder la premiere occurrence
+        ids: dict[int, None] = {}
+        for bucket in buckets:
+            if limit:
+                remaining = limit - len(ids)
+                if remaining <= 0:
+                    break
+                bucket = bucket.limit(remaining)
+            for row in bucket:
+                ids.setdefault(row[0])
+        return list(ids)
+
+    def _iter_cards(
+        self,
+        session: Session,
+        card_ids: list[int],
+        as_of: date,
+        chunk_size: int = 500,
+    ):
+        """
+        Itere sur les cartes par paquets de chunk_size, dans l'ordre de card_ids.
+
+        Chaque paquet est charge en une requete (set joint pour peupler
+        Card.set_info) avec ses snapshots precedents. Les cartes restent
+        attachees a la session: l'appelant les detache une fois traitees
+        (elles peuvent encore etre dans la fenetre de collecte quand le
+        paquet suivant est charge).
+
+        Yields:
+            (Card, snapshot precedent ou None)
+        """
+        from sqlalchemy.orm import contains_eager
+
+        for start in range(0, len(card_ids), chunk_size):
+            chunk = card_ids[start:start + chunk_size]
+            cards = session.query(Card).join(Card.set_info).options(
+                contains_eager(Card.set_info)
+            ).filter(Card.id.in_(chunk)).all()
+            by_id = {card.id: card for card in cards}
+            prev_map = self._get_previous_snapshots(session, chunk, as_of, chunk_size)
+
+            for card_id in chunk:
+                card = by_id.get(card_id)
+                if card is not None:
+                    yield card, prev_map.get(card_id)
+
+    def _get_previous_snapshots(
+        self,
+        session: Session,
+        card_ids: list[int],
+        as_of: date,
+        chunk_size: int = 500,
+    ) -> dict[int, MarketSnapshot]:
+        """
+        Recupere le dernier snapshot anterieur a as_of pour chaque carte.
 
-        if set_id:
-            query = query.filter(Card.set_id == set_id)
+        Une requete ROW_NUMBER() par paquet de chunk_size cartes au lieu d'une
+        requete par carte. Les snapshots sont detaches de la session pour ne
+        pas etre expires (et recharges un par un) aux commits du batch.
 
-        # Exclure les series et sets masques dans la config
-        if excluded_series:
-            query = query.filter(~Set.serie_id.in_(excluded_series))
-        if excluded_sets:
-            query = query.filter(~Set.id.in_(excluded_sets))
+        Returns:
+            Dict card_id -> MarketSnapshot precedent
+        """
+        from sqlalchemy import func
+
+        prev_map: dict[int, MarketSnapshot] = {}
+        for start in range(0, len(card_ids), chunk_size):
+            chunk = card_ids[start:start + chunk_size]
+            ranked = session.query(
+                MarketSnapshot.id,
+                func.row_number().over(
+                    partition_by=MarketSnapshot.card_id,
+                    order_by=(MarketSnapshot.as_of_date.desc(), MarketSnapshot.id.desc()),
+                ).label("rn"),
+            ).filter(
+                MarketSnapshot.card_id.in_(chunk),
+                MarketSnapshot.as_of_date < as_of,
+            ).subquery()
 
-        if limit:
-            query = query.limit(limit)
+            snapshots = session.query(MarketSnapshot).join(
+                ranked, MarketSnapshot.id == ranked.c.id
+            ).filter(ranked.c.rn == 1).all()
 
-        return query.all()
+            for snapshot in snapshots:
+                session.expunge(snapshot)
+                prev_map[snapshot.card_id] = snapshot
 
-    def _process_card(
+        return prev_map
+
+    def _submit_collect(
         self,
-        session: Session,
+        executor: Optional[ThreadPoolExecutor],
         card: Card,
-        mode: BatchMode,
-        anomalies: AnomalyReport
-    ) -> str:
+    ) -> Optional[Future]:
         """
-        Traite une carte.
+        Prepare la carte et lance sa collecte eBay dans le pool.
 
-        Returns:
-            "success", "skipped", ou "failed"
+        La generation de la requete (qui modifie la carte) reste sur le thread
+        appelant; la requete est ecrite au checkpoint avec les autres mises a
+        jour (la carte est detachee de la session une fois traitee). Retourne
+        None hors mode FULL_EBAY (pas de pool).
         """
-        as_of = date.today()
-
         # Generer la requete eBay si necessaire
         if not card.ebay_query and not card.ebay_query_override:
-            self.query_builder.generate_for_card(card)
+            query = self.query_builder.generate_for_card(card)
+            self._query_updates[card.id] = {"id": card.id, "ebay_query": query}
+
+        if executor is None:
+            return None
+        return executor.submit(self.worker.collect_for_card, card)
+
+    def _process_card(
+        self,
+        session: Session,
+        card: Card,
+        anomalies: AnomalyReport,
+        as_of: date,
+        now: datetime,
+        previous_snapshot: Optional[MarketSnapshot] = None,
+        collected: Optional[CollectionResult] = None,
+    ) -> tuple[str, Optional[str]]:
+        """
+        Traite une carte en mode FULL_EBAY (le mode HYBRID passe par
+        _run_hybrid_bulk).
 
-        # Recuperer le snapshot precedent pour comparaison
-        previous_snapshot = session.query(MarketSnapshot).filter(
-            MarketSnapshot.card_id == card.id,
-            MarketSnapshot.as_of_date < as_of
-        ).order_by(MarketSnapshot.as_of_date.desc()).first()
+        Le snapshot et les champs d'erreur de la carte sont mis en attente
+        et ecrits en bulk au prochain checkpoint (voir _flush_pending).
 
+        Args:
+            as_of: Date du snapshot (fixee au debut du run)
+            now: Horodatage des erreurs (debut du run)
+            previous_snapshot: Dernier snapshot anterieur (voir _get_previous_snapshots)
+            collected: Resultat de collecte eBay deja obtenu (voir _submit_collect);
+                collecte ici si absent
+
+        Returns:
+            ("success" | "skipped" | "failed", message d'erreur eventuel)
+        """
         # Collecter les donnees eBay
-        if mode == BatchMode.FULL_EBAY:
-            result = self.worker.collect_for_card(card)
-
-            if not result.success:
-                # Stocker l'erreur sur la carte (avec active_count si disponible)
-                error_msg = result.error
-                if result.active_count > 0:
-                    error_msg = f"{result.error} ({result.active_count} résultats eBay)"
-                card.last_error = error_msg
-                card.last_error_at = datetime.utcnow()
-                card.error_count = (card.error_count or 0) + 1  # Incrementer le compteur d'erreurs
-
-                # Pas de fallback - echec direct si pas de resultat eBay
-                anomalies.query_issues.append({
-                    "card_id": card.id,
-                    "name": card.name,
-                    "error": result.error,
-                    "query": result.query_used,
-                })
-                return "failed"
-            else:
-                # Succes: effacer l'erreur precedente et reinitialiser le compteur
-                card.last_error = None
-                card.last_error_at = None
-                card.error_count = 0
-                # Creer le snapshot depuis les donnees eBay
-                snapshot = self.worker.create_snapshot(card, result, as_of, items=result.items)
-
-                # Detecter les ventes (annonces disparues)
-                if previous_snapshot:
-                    self.worker.detect_sold_listings(session, card, snapshot, previous_snapshot, is_reverse=False)
-                    # Aussi pour les reverse si applicable
-                    if card.variant != Variant.REVERSE:
-                        self.worker.detect_sold_listings(session, card, snapshot, previous_snapshot, is_reverse=True)
-
-                # Appliquer les garde-fous
-                guardrail_result = self.guardrails.apply_to_snapshot(snapshot, card)
-
-                if guardrail_result.is_mismatch:
-                    anomalies.mismatches.append({
-                        "card_id": card.id,
-                        "name": card.name,
-                        "reason": guardrail_result.mismatch_reason,
-                        "original_anchor": guardrail_result.original_anchor,
-                        "final_anchor": guardrail_result.final_anchor,
-                    })
-
-        else:  # HYBRID mode
-            # Utiliser Cardmarket directement
-            cm_value = card.cm_max
-            if cm_value is None or cm_value <= 0:
-                card.error_count = (card.error_count or 0) + 1
-                return "failed"
-            # Succes en mode HYBRID
-            card.error_count = 0
-
-            snapshot = MarketSnapshot(
-                card_id=card.id,
-                as_of_date=as_of,
-                anchor_price=cm_value,
-                anchor_source=AnchorSource.CARDMARKET_FALLBACK,
+        result = collected if collected is not None else self.worker.collect_for_card(card)
+
+        if not result.success:
+            # Stocker l'erreur sur la carte (avec active_count si disponible)
+            error_msg = result.error
+            if result.active_count > 0:
+                error_msg = f"{result.error} ({result.active_count} résultats eBay)"
+            self._increment_card_errors(
+                session, card, last_error=error_msg, last_error_at=now
             )
 
+            # Pas de fallback - echec direct si pas de resultat eBay
+            anomalies.query_issues.append({
+                "card_id": card.id,
+                "name": card.name,
+                "error": result.error,
+                "query": result.query_used,
+            })
+            return "failed", error_msg
+
+        # Succes: effacer l'erreur precedente et reinitialiser le compteur
+        self._queue_card_update(card, None, None, 0)
+        # Creer le snapshot depuis les donnees eBay
+        snapshot = self.worker.create_snapshot(card, result, as_of, items=result.items)
+
+        # Detecter les ventes (annonces disparues)
+        # (aussi les reverse si applicable, dans le meme passage)
+        if previous_snapshot:
+            self.worker.detect_sold_listings(
+                session, card, snapshot, previous_snapshot,
+                variants=("normal",) if card.variant == Variant.REVERSE else ("normal", "reverse"),
+            )
+
+        # Appliquer les garde-fous
+        guardrail_result = self.guardrails.apply_to_snapshot(snapshot, card)
+
+        if guardrail_result.is_mismatch:
+            anomalies.mismatches.append({
+                "card_id": card.id,
+                "name": card.name,
+                "reason": guardrail_result.mismatch_reason,
+                "original_anchor": guardrail_result.original_anchor,
+                "final_anchor": guardrail_result.final_anchor,
+            })
+
         # Detecter les anomalies
         self._check_anomalies(snapshot, previous_snapshot, card, anomalies)
 
-        # Sauvegarder le snapshot (plus de calcul de prix de rachat)
-        session.add(snapshot)
+        # Sauvegarder le snapshot (insere en bulk au prochain checkpoint)
+        self._pending_snapshots.append(_snapshot_row(snapshot))
 
-        return "success"
+        return "success", None
+
+    def _run_hybrid_bulk(
+        self,
+        session: Session,
+        card_ids: list[int],
+        as_of: date,
+        stats: BatchStats,
+        anomalies: AnomalyReport,
+        results: dict[str, list],
+        batch_run: BatchRun,
+        progress_callback: Optional[Callable] = None,
+        chunk_size: int = 500,
+    ) -> None:
+        """
+        Mode HYBRID ensembliste: snapshots Cardmarket sans passer par l'ORM carte par carte.
+
+        Par paquet de chunk_size cartes: lecture des colonnes utiles, decisions
+        (succes/echec/set ignore, anomalies) en Python, puis un INSERT ... SELECT
+        des snapshots et deux UPDATE (succes, echecs). Une carte sans cm_max
+        positif est en echec; sinon son snapshot prend cm_max comme ancre
+        (source CARDMARKET_FALLBACK).
+        """
+        # cm_max (max de trend et avg30 non NULL), cote SQL
+        cm_max = case(
+            (Card.cm_trend.is_(None), Card.cm_avg30),
+            (Card.cm_avg30.is_(None), Card.cm_trend),
+            (Card.cm_trend >= Card.cm_avg30, Card.cm_trend),
+            else_=Card.cm_avg30,
+        )
+        anchor_source = literal(AnchorSource.CARDMARKET_FALLBACK, MarketSnapshot.__table__.c.anchor_source.type)
+
+        set_failures: dict[str, int] = {}
+        skipped_sets: set[str] = set()
+
+        for start in range(0, len(card_ids), chunk_size):
+            # Arret demande: verifie entre les paquets
+            if is_stop_requested():
+                console.print("[yellow]Batch interrompu par l'utilisateur[/yellow]")
+                break
+
+            chunk = card_ids[start:start + chunk_size]
+            rows = session.query(
+                Card.id, Card.tcgdex_id, Card.name, Card.set_id, Card.set_name,
+                Card.cm_trend, Card.cm_avg30, Card.last_error,
+            ).filter(Card.id.in_(chunk)).all()
+            by_id = {row.id: row for row in rows}
+            prev_map = self._get_previous_snapshots(session, chunk, as_of, chunk_size)
+
+            succeeded: list[int] = []
+            failed: list[int] = []
+            for card_id in chunk:
+                card = by_id.get(card_id)
+                if card is None:
+                    continue
+
+                if card.set_id in skipped_sets:
+                    stats.skipped += 1
+                    _record(results, card, "skipped", f"Set {card.set_id} ignore (trop d'echecs)")
+                else:
+                    cm_values = [v for v in (card.cm_trend, card.cm_avg30) if v is not None]
+                    cm_value = max(cm_values) if cm_values else None
+                    if cm_value is None or cm_value <= 0:
+                        failed.append(card_id)
+                        stats.failed += 1
+                        set_failures[card.set_id] = set_failures.get(card.set_id, 0) + 1
+                        if set_failures[card.set_id] >= self.MAX_SET_FAILURES:
+                            console.print(f"[yellow]Set {card.set_id} ignore apres {self.MAX_SET_FAILURES} echecs[/yellow]")
+                            skipped_sets.add(card.set_id)
+                            stats.skipped_sets.append(card.set_id)
+                        _record(results, card, "failed", card.last_error)
+                    else:
+                        succeeded.append(card_id)
+                        stats.succeeded += 1
+                        if card.set_id in set_failures:
+                            set_failures[card.set_id] = 0
+                        self._check_variation(cm_value, prev_map.get(card_id), card, anomalies)
+                        _record(results, card, "success")
+
+                stats.processed += 1
+
+            if succeeded:
+                session.execute(
+                    insert(MarketSnapshot.__table__).from_select(
+                        ["card_id", "as_of_date", "anchor_price", "anchor_source", "created_at"],
+                        select(
+                            Card.id, literal(as_of, Date), cm_max, anchor_source,
+                            literal(datetime.utcnow(), DateTime),
+                        ).where(Card.id.in_(succeeded)),
+                    )
+                )
+                session.execute(
+                    update(Card).where(Card.id.in_(succeeded)).values(error_count=0)
+                    .execution_options(synchronize_session=False)
+                )
+            if failed:
+                session.execute(
+                    update(Card).where(Card.id.in_(failed))
+                    .values(error_count=func.coalesce(Card.error_count, 0) + 1)
+                    .execution_options(synchronize_session=False)
+                )
+
+            # Generer les requetes eBay manquantes des cartes traitees
+            missing_query = session.query(Card).filter(
+                Card.id.in_(succeeded + failed),
+                or_(Card.ebay_query.is_(None), Card.ebay_query == ""),
+                or_(Card.ebay_query_override.is_(None), Card.ebay_query_override == ""),
+            )
+            for card in missing_query:
+                self.query_builder.generate_for_card(card)
+
+            batch_run.cards_succeeded = stats.succeeded
+            batch_run.cards_failed = stats.failed
+            session.commit()
+
+            if progress_callback:
+                progress_callback(stats.processed, stats.total_cards, stats.succeeded, stats.failed)
 
     def _check_anomalies(
         self,
@@ -661,22 +1053,31 @@ class BatchRunner:
     ) -> None:
         """Detecte les anomalies pour le rapport."""
         # High dispersion
-        if snapshot.dispersion and snapshot.dispersion > self.config.guardrails.dispersion_bad:
+        if snapshot.dispersion and snapshot.dispersion > self._dispersion_bad:
             anomalies.high_dispersions.append({
                 "card_id": card.id,
                 "name": card.name,
                 "dispersion": snapshot.dispersion,
             })
 
-        # High variation vs previous
-        if previous and previous.anchor_price and snapshot.anchor_price:
-            variation = abs(snapshot.anchor_price - previous.anchor_price) / previous.anchor_price
-            if variation > 0.6:  # > 60%
+        self._check_variation(snapshot.anchor_price, previous, card, anomalies)
+
+    def _check_variation(
+        self,
+        anchor_price: Optional[float],
+        previous: Optional[MarketSnapshot],
+        card: Card,
+        anomalies: AnomalyReport
+    ) -> None:
+        """Detecte une forte variation de l'ancre vs le snapshot precedent."""
+        if previous and previous.anchor_price and anchor_price:
+            variation = abs(anchor_price - previous.anchor_price) / previous.anchor_price
+            if variation > self._variation_threshold:
                 anomalies.high_variations.append({
                     "card_id": card.id,
                     "name": card.name,
                     "previous": previous.anchor_price,
-                    "current": snapshot.anchor_price,
+                    "current": anchor_price,
                     "variation_pct": variation * 100,
                 })
 
@@ -702,7 +1103,7 @@ class BatchRunner:
 
         lines.extend([
             "",
-            f"High variations (>60%): {len(anomalies.high_variations)}",
+            f"High variations (>{self._variation_threshold:.0%}): {len(anomalies.high_variations)}",
             f"High dispersions: {len(anomalies.high_dispersions)}",
             f"Query issues: {len(anomalies.query_issues)}",
             f"Mismatches (fallback CM): {len(anomalies.mismatches)}",
@@ -3,14 +3,41 @@ Configuration centralisee pour l'outil de pricing.
 Tous les parametres des specs sont definis ici.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, fields
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Optional
 import os
 import yaml
 
+# Parser/emetteur libyaml (C) si PyYAML a ete compile avec, sinon version Python
+_YAML_LOAD = partial(yaml.load, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+_YAML_DUMP = partial(
+    yaml.dump,
+    Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+    default_flow_style=False,
+    allow_unicode=True,
+)
 
-@dataclass
+
+# Fichier de config par defaut (relatif au repertoire courant)
+_DEFAULT_CONFIG_PATH = Path("config.yaml")
+
+
+def _read_config_file(config_path: Path) -> dict:
+    """Lit config.yaml; le resultat est memorise dans le process tant que le
+    fichier (mtime, taille) ne change pas."""
+    stat = os.stat(config_path)
+    return _parse_config_file(os.fspath(config_path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=8)
+def _parse_config_file(path: str, mtime_ns: int, size: int) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return _YAML_LOAD(f) or {}
+
+
+@dataclass(frozen=True, slots=True)
 class PricingConfig:
     """Parametres de calcul du prix de rachat."""
 
@@ -48,7 +75,7 @@ class PricingConfig:
     coef_correct: float = 0.30
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GuardrailsConfig:
     """Parametres des garde-fous Cardmarket."""
 
@@ -59,8 +86,11 @@ class GuardrailsConfig:
     # Dispersion maximale acceptable
     dispersion_bad: float = 4.0
 
+    # Variation d'ancre vs snapshot precedent signalee dans le rapport (0.6 = 60%)
+    variation_threshold: float = 0.6
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class EbayConfig:
     """Parametres eBay API."""
 
@@ -92,8 +122,14 @@ class EbayConfig:
     # Limite quotidienne d'appels API (Browse API = 5000/jour en production)
     daily_limit: int = 5000
 
+    # Nombre de collectes eBay en parallele pendant un batch
+    concurrency: int = 8
+
+    # Fichier JSON partageant le token OAuth entre processus ("" = memoire seule)
+    token_cache_path: str = ""
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class TCGdexConfig:
     """Parametres TCGdex API."""
 
@@ -110,7 +146,7 @@ class TCGdexConfig:
     excluded_sets: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DatabaseConfig:
     """Parametres base de donnees."""
 
@@ -118,7 +154,58 @@ class DatabaseConfig:
     echo_sql: bool = False
 
 
-@dataclass
+# Section YAML -> dataclass (attribut AppConfig du meme nom)
+_SECTION_TYPES = {
+    "pricing": PricingConfig,
+    "guardrails": GuardrailsConfig,
+    "ebay": EbayConfig,
+    "tcgdex": TCGdexConfig,
+}
+
+
+def _coerce(kind: type, value, key: str):
+    """Convertit une valeur YAML numerique, en nommant la cle fautive."""
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Configuration invalide: {key} = {value!r} (attendu: {kind.__name__})") from None
+
+
+def _build_section_collector():
+    """Genere la fonction qui extrait les champs connus de chaque section YAML.
+
+    Comme dataclasses pour __init__, on compile une fois un code en ligne
+    droite (un test par champ) au lieu de filtrer chaque cle dynamiquement.
+    Les champs float/int sont convertis au chargement ("0.27" -> 0.27) pour
+    que les calculs de pricing ne recoivent jamais de chaines; une cle vide
+    (None) garde la valeur par defaut.
+    """
+    lines = ["def _collect_sections(data):", "    sections = {}"]
+    for section, section_type in _SECTION_TYPES.items():
+        lines.append("    kwargs = {}")
+        lines.append(f"    s = data.get({section!r})")
+        lines.append("    if s:")
+        for f in fields(section_type):
+            if f.type in (float, int):
+                key = f"{section}.{f.name}"
+                lines.append(
+                    f"        if s.get({f.name!r}) is not None: "
+                    f"kwargs[{f.name!r}] = _coerce({f.type.__name__}, s[{f.name!r}], {key!r})"
+                )
+            else:
+                lines.append(f"        if {f.name!r} in s: kwargs[{f.name!r}] = s[{f.name!r}]")
+        lines.append(f"    sections[{section!r}] = kwargs")
+    lines.append("    return sections")
+
+    namespace: dict = {}
+    exec("\n".join(lines), {"_coerce": _coerce}, namespace)
+    return namespace["_collect_sections"]
+
+
+_collect_sections = _build_section_collector()
+
+
+@dataclass(frozen=True, slots=True)
 class AppConfig:
     """Configuration globale de l'application."""
 
@@ -144,128 +231,92 @@ class AppConfig:
         - EBAY_CLIENT_SECRET
         - FLASK_SECRET_KEY
         """
-        config = cls()
+        # Les dataclasses etant figees, on collecte les valeurs par section
+        # puis on construit les instances en une fois
+        sections: dict[str, dict] = {section: {} for section in _SECTION_TYPES}
+        database: dict = {}
+        app: dict = {}
 
         if config_path is None:
-            config_path = Path("config.yaml")
-
-        if config_path.exists():
-            with open(config_path) as f:
-                data = yaml.safe_load(f) or {}
-
-            # Pricing
-            if "pricing" in data:
-                for key, value in data["pricing"].items():
-                    if hasattr(config.pricing, key):
-                        setattr(config.pricing, key, value)
-
-            # Guardrails
-            if "guardrails" in data:
-                for key, value in data["guardrails"].items():
-                    if hasattr(config.guardrails, key):
-                        setattr(config.guardrails, key, value)
-
-            # eBay
-            if "ebay" in data:
-                for key, value in data["ebay"].items():
-                    if hasattr(config.ebay, key):
-                        setattr(config.ebay, key, value)
-
-            # TCGdex
-            if "tcgdex" in data:
-                for key, value in data["tcgdex"].items():
-                    if hasattr(config.tcgdex, key):
-                        setattr(config.tcgdex, key, value)
+            config_path = _DEFAULT_CONFIG_PATH
+
+        if os.path.isfile(config_path):
+            data = _read_config_file(config_path)
+
+            # Sections simples (pricing, guardrails, ebay, tcgdex)
+            sections = _collect_sections(data)
 
             # Database
             if "database" in data:
                 if "db_path" in data["database"]:
-                    config.database.db_path = Path(data["database"]["db_path"])
+                    database["db_path"] = Path(data["database"]["db_path"])
                 if "echo_sql" in data["database"]:
-                    config.database.echo_sql = data["database"]["echo_sql"]
+                    database["echo_sql"] = data["database"]["echo_sql"]
 
             # Admin
             if "admin" in data:
                 if "host" in data["admin"]:
-                    config.admin_host = data["admin"]["host"]
+                    app["admin_host"] = data["admin"]["host"]
                 if "port" in data["admin"]:
-                    config.admin_port = data["admin"]["port"]
+                    app["admin_port"] = data["admin"]["port"]
 
         # Override secrets depuis variables d'environnement (prioritaire)
         if os.environ.get("EBAY_CLIENT_ID"):
-            config.ebay.client_id = os.environ["EBAY_CLIENT_ID"]
+            sections["ebay"]["client_id"] = os.environ["EBAY_CLIENT_ID"]
         if os.environ.get("EBAY_CLIENT_SECRET"):
-            config.ebay.client_secret = os.environ["EBAY_CLIENT_SECRET"]
+            sections["ebay"]["client_secret"] = os.environ["EBAY_CLIENT_SECRET"]
         if os.environ.get("FLASK_SECRET_KEY"):
-            config.flask_secret_key = os.environ["FLASK_SECRET_KEY"]
-        else:
-            config.flask_secret_key = "dev-secret-key-change-in-production"
-
-        return config
+            app["flask_secret_key"] = os.environ["FLASK_SECRET_KEY"]
+
+        return cls(
+            pricing=PricingConfig(**sections["pricing"]),
+            guardrails=GuardrailsConfig(**sections["guardrails"]),
+            ebay=EbayConfig(**sections["ebay"]),
+            tcgdex=TCGdexConfig(**sections["tcgdex"]),
+            database=DatabaseConfig(**database),
+            **app,
+        )
+
+    def _to_dict(self) -> dict:
+        """Donnees serialisees dans config.yaml (meme structure que load)."""
+        data = asdict(self)
+        data["database"]["db_path"] = str(self.database.db_path)
+        data["admin"] = {
+            "host": data.pop("admin_host"),
+            "port": data.pop("admin_port"),
+        }
+        # Le secret Flask vient uniquement de FLASK_SECRET_KEY
+        data.pop("flask_secret_key")
+        return data
 
     def save(self, config_path: Optional[Path] = None) -> None:
         """Sauvegarde la config dans un fichier YAML."""
         if config_path is None:
-            config_path = Path("config.yaml")
-
-        data = {
-            "pricing": {
-                "min_card_value_eur": self.pricing.min_card_value_eur,
-                "margin_target": self.pricing.margin_target,
-                "fees_rate": self.pricing.fees_rate,
-                "fixed_costs_eur": self.pricing.fixed_costs_eur,
-                "risk_base": self.pricing.risk_base,
-                "min_buy_price": self.pricing.min_buy_price,
-                "max_buy_price": self.pricing.max_buy_price,
-                "rounding_step": self.pricing.rounding_step,
-                "coef_neuf": self.pricing.coef_neuf,
-                "coef_bon": self.pricing.coef_bon,
-                "coef_correct": self.pricing.coef_correct,
-            },
-            "guardrails": {
-                "mismatch_upper": self.guardrails.mismatch_upper,
-                "mismatch_lower": self.guardrails.mismatch_lower,
-                "dispersion_bad": self.guardrails.dispersion_bad,
-            },
-            "ebay": {
-                "client_id": self.ebay.client_id,
-                "client_secret": self.ebay.client_secret,
-                "marketplace_id": self.ebay.marketplace_id,
-                "sample_limit": self.ebay.sample_limit,
-            },
-            "tcgdex": {
-                "language": self.tcgdex.language,
-                "excluded_series": self.tcgdex.excluded_series,
-                "excluded_sets": self.tcgdex.excluded_sets,
-            },
-            "database": {
-                "db_path": str(self.database.db_path),
-            },
-            "admin": {
-                "host": self.admin_host,
-                "port": self.admin_port,
-            },
-        }
+            config_path = _DEFAULT_CONFIG_PATH
+
+        path = os.fspath(config_path)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            _YAML_DUMP(self._to_dict(), f)
+
 
-        config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(config_path, "w") as f:
-            yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+# Singleton global: fichier source du singleton (None = config.yaml)
+_config_path: Optional[Path] = None
 
 
-# Singleton global
-_config: Optional[AppConfig] = None
+@lru_cache(maxsize=1)
+def _load_config() -> AppConfig:
+    return AppConfig.load(_config_path)
 
 
 def get_config() -> AppConfig:
     """Retourne la configuration globale (singleton)."""
-    global _config
-    if _config is None:
-        _config = AppConfig.load()
-    return _config
+    return _load_config()
 
 
 def reload_config(config_path: Optional[Path] = None) -> AppConfig:
     """Recharge la configuration."""
-    global _config
-    _config = AppConfig.load(config_path)
-    return _config
+    global _config_path
+    _config_path = config_path
+    _load_config.cache_clear()
+    return _load_config()
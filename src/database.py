@@ -2,12 +2,15 @@
 Gestion de la base de donnees SQLite.
 """
 
+import os
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Generator, Optional
 
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 
 from .models import Base
 from .config import get_config, AppConfig
@@ -17,6 +20,21 @@ _engine = None
 _SessionLocal = None
 
 
+# PRAGMA appliques a chaque nouvelle connexion SQLite
+_PRAGMAS = (
+    "PRAGMA foreign_keys=ON;"
+    "PRAGMA journal_mode=WAL;"  # Write-Ahead Logging
+    "PRAGMA busy_timeout=30000;"  # 30 sec timeout
+    "PRAGMA synchronous=NORMAL;"  # Suffisant (et sans risque de corruption) en WAL
+    "PRAGMA temp_store=MEMORY;"
+)
+
+
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    """Configure une connexion SQLite (un seul aller-retour pour tous les PRAGMA)."""
+    dbapi_connection.executescript(_PRAGMAS)
+
+
 def get_engine(config: Optional[AppConfig] = None):
     """Retourne le moteur SQLAlchemy (singleton)."""
     global _engine
@@ -31,23 +49,27 @@ def get_engine(config: Optional[AppConfig] = None):
         db_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Creer le moteur SQLite avec timeout pour eviter "database is locked"
+        # Pool de connexions persistantes: connect + PRAGMA une seule fois par
+        # connexion physique, pas a chaque session. Jamais moins que les
+        # valeurs par defaut de SQLAlchemy (5 + 10); les connexions gardees
+        # ouvertes suivent ebay.concurrency (chaque batch en tient deux:
+        # session principale + report d'usage, et la queue en lance plusieurs)
         _engine = create_engine(
-            f"sqlite:///{db_path}",
+            URL.create("sqlite", database=os.fspath(db_path)),
             echo=config.database.echo_sql,
+            poolclass=QueuePool,
+            pool_size=max(5, config.ebay.concurrency),
+            max_overflow=10,
             connect_args={
-                "check_same_thread": False,  # Pour multi-thread
+                # Requis: le pool rend une connexion au thread suivant qui la
+                # demande (requetes Flask, dispatcher de la queue, batch)
+                "check_same_thread": False,
                 "timeout": 30,  # 30 secondes timeout pour lock
             },
         )
 
         # Configurer SQLite pour meilleure concurrence
-        @event.listens_for(_engine, "connect")
-        def set_sqlite_pragma(dbapi_connection, connection_record):
-            cursor = dbapi_connection.cursor()
-            cursor.execute("PRAGMA foreign_keys=ON")
-            cursor.execute("PRAGMA journal_mode=WAL")  # Write-Ahead Logging
-            cursor.execute("PRAGMA busy_timeout=30000")  # 30 sec timeout
-            cursor.close()
+        event.listen(_engine, "connect", _set_sqlite_pragma)
 
     return _engine
 
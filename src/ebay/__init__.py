@@ -1,5 +1,20 @@
-from .client import EbayClient
-from .query_builder import EbayQueryBuilder
-from .worker import EbayWorker
+import importlib
 
 __all__ = ["EbayClient", "EbayQueryBuilder", "EbayWorker"]
+
+# Sous-modules importes au premier acces (PEP 562): EbayQueryBuilder seul ne
+# charge ni httpx ni le worker
+_LAZY_ATTRS = {
+    "EbayClient": ".client",
+    "EbayQueryBuilder": ".query_builder",
+    "EbayWorker": ".worker",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
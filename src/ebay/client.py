@@ -3,18 +3,41 @@ Client eBay Browse API avec OAuth2.
 Documentation: https://developer.ebay.com/api-docs/buy/browse/overview.html
 """
 
+import asyncio
 import base64
+import json
+import math
+import os
+import re
+import threading
 import time
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional, Any, Callable
 
 import httpx
+from rich.console import Console
+try:
+    import ahocorasick  # pyahocorasick (optionnel)
+except ImportError:
+    ahocorasick = None
+try:
+    import orjson  # optionnel: decodage JSON plus rapide
+except ImportError:
+    orjson = None
+try:
+    import h2  # noqa: F401  httpx[http2] (optionnel): multiplexage HTTP/2
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from ..config import get_config, EbayConfig
 
+console = Console()
 
-@dataclass
+
+@dataclass(slots=True)
 class EbayItem:
     """Representation d'un item eBay."""
     item_id: str
@@ -38,7 +61,7 @@ class EbayItem:
         return self.price
 
 
-@dataclass
+@dataclass(slots=True)
 class EbaySearchResult:
     """Resultat d'une recherche eBay."""
     total: int
@@ -63,6 +86,228 @@ class EbayRateLimitError(Exception):
     pass
 
 
+# Statuts transitoires reessayes avec backoff (passerelle). Pas 429: c'est le
+# quota journalier eBay, le batch doit s'arreter tout de suite (EbayRateLimitError)
+_RETRYABLE_STATUS = frozenset({502, 503, 504})
+
+
+class _RetryableStatus(Exception):
+    """Reponse HTTP transitoire, a reessayer."""
+
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+# Backoff entre deux tentatives, sauf si eBay indique un delai (Retry-After)
+_BACKOFF = wait_exponential(multiplier=0.5, max=4)
+_MAX_RETRY_AFTER = 30
+
+
+def _retry_wait(retry_state) -> float:
+    """Delai avant la prochaine tentative (Retry-After en secondes si present)."""
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, _RetryableStatus):
+        retry_after = exc.response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), _MAX_RETRY_AFTER)
+    return _BACKOFF(retry_state)
+
+
+def _last_response(retry_state) -> httpx.Response:
+    """Tentatives epuisees: renvoie la derniere reponse (l'appelant gere le
+    statut comme avant) ou releve l'erreur reseau."""
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, _RetryableStatus):
+        return exc.response
+    return retry_state.outcome.result()
+
+
+def _response_json(response: httpx.Response) -> Any:
+    """Decode le corps JSON d'une reponse (orjson directement sur les octets si dispo)."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# Tokens OAuth partages par les clients du process: client_id -> (token, expiration)
+_TOKEN_CACHE: dict[str, tuple[str, float]] = {}
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+
+def _read_token_file(path: str, client_id: str) -> Optional[tuple[str, float]]:
+    """Token encore valide pour client_id dans le fichier de cache, sinon None."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)[client_id]
+        token, expires_at = entry["token"], float(entry["exp"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if time.time() >= expires_at:
+        return None
+    return token, expires_at
+
+
+def _write_token_file(path: str, client_id: str, token: str, expires_at: float) -> None:
+    """Enregistre le token dans le fichier de cache (ecriture atomique, lisible
+    par le seul proprietaire)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            data = {}
+    except (OSError, ValueError):
+        data = {}
+    data[client_id] = {"token": token, "exp": expires_at}
+
+    tmp_path = path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # Cache disque indisponible: le token reste en memoire
+
+
+class _KeywordMatcher:
+    """Detecte en un passage si un texte contient un des mots-cles (sous-chaines).
+
+    Automate Aho-Corasick si pyahocorasick est installe, sinon une alternation
+    regex. Les patterns regex eventuels sont toujours testes par une regex.
+    """
+
+    __slots__ = ("_automaton", "_regex")
+
+    def __init__(self, keywords: list[str], patterns: Optional[list[str]] = None):
+        patterns = patterns or []
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+            self._regex = re.compile("|".join(patterns)) if patterns else None
+        else:
+            self._automaton = None
+            self._regex = re.compile("|".join([*map(re.escape, keywords), *patterns]))
+
+    def search(self, text: str) -> bool:
+        if self._automaton is not None:
+            for _ in self._automaton.iter(text):
+                return True
+        return self._regex is not None and self._regex.search(text) is not None
+
+
+class _CardNumberMatcher:
+    """Regex du numero de carte, precedee de tests de sous-chaines.
+
+    Les litteraux que la regex exige (chiffres du numero, "/") sont testes
+    avec "in" avant de lancer la regex: la plupart des titres qui n'ont pas
+    le bon numero sont ecartes sans passer par le moteur regex.
+    """
+
+    __slots__ = ("_literals", "_regex")
+
+    def __init__(self, regex: str, literals: tuple[str, ...] = ()):
+        self._regex = re.compile(regex)
+        self._literals = literals
+
+    def search(self, title: str) -> Optional[re.Match]:
+        for literal in self._literals:
+            if literal not in title:
+                return None
+        return self._regex.search(title)
+
+
+@lru_cache(maxsize=1024)
+def _build_card_number_matcher(
+    card_number: Optional[str], card_number_full: Optional[str]
+) -> Optional[_CardNumberMatcher]:
+    """Matcher (construit une fois par numero) qui doit trouver le numero dans
+    le titre d'une annonce.
+
+    Le numero doit apparaitre dans le titre, precede d'un non-chiffre
+    Ex: "1/102" doit matcher "1/102" mais pas "21/102" ou "1" dans "Edition 1"
+    Retourne None si card_number_full est absent (promo, cartes speciales):
+    pas de filtrage sur le numero.
+    """
+    if not (card_number and card_number_full):
+        return None
+
+    if "/" in card_number_full:
+        num, total = card_number_full.split("/")
+
+        # Verifier si le numero est purement numerique ou alphanumerique (ex: SL7)
+        if num.isdecimal():
+            # Format numerique classique X/Y
+            # int() enleve les zeros de padding pour la comparaison flexible
+            num_literal = str(int(num))
+            total_literal = str(int(total)) if total.isdecimal() else total.lstrip('0') or '0'
+            # Pattern: X/Y avec X non precede d'un chiffre, zeros optionnels
+            # Accepte 039/094, 39/94, 039/94, etc.
+            return _CardNumberMatcher(
+                rf'(?<![0-9])0*{num_literal}\s*/\s*0*{re.escape(total_literal)}',
+                (num_literal, "/", total_literal),
+            )
+
+        # Format alphanumerique (ex: SL7/95, TG01/30)
+        # Chercher juste le numero (SL7) sans le total, insensible a la casse
+        # Pattern: le numero alphanumerique comme mot distinct
+        return _CardNumberMatcher(rf'(?i)\b{re.escape(num)}\b')
+
+    # Format sans slash (rare mais possible)
+    # Pattern: numero precede d'un non-chiffre et suivi d'un non-chiffre
+    return _CardNumberMatcher(rf'(?<![0-9]){re.escape(card_number)}(?![0-9])', (card_number,))
+
+
+class _SearchPages:
+    """Pages accumulees par search_all (regles d'arret de la pagination)."""
+
+    __slots__ = ("max_items", "limit", "items", "offset", "total")
+
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self.limit = min(max_items, 200)
+        self.items: list[EbayItem] = []
+        self.offset = 0  # Offset de la prochaine page
+        self.total = 0
+
+    def add(self, result: EbaySearchResult) -> bool:
+        """Integre la page suivante; retourne False quand la pagination est finie."""
+        self.total = result.total
+        if not result.items:
+            return False
+        self.items.extend(result.items)
+        self.offset += self.limit  # Must increment by limit, not filtered count
+        return self.offset < self.total and len(self.items) < self.max_items
+
+    def next_offsets(self, max_pages: int) -> list[int]:
+        """Offsets de la prochaine vague de pages.
+
+        Le nombre de pages est estime d'apres le rendement (items gardes apres
+        filtrage) des pages deja lues, pour ne pas consommer d'appels inutiles.
+        """
+        pages_read = self.offset // self.limit
+        if pages_read == 0:
+            return [0]
+        per_page = len(self.items) / pages_read
+        needed = math.ceil((self.max_items - len(self.items)) / per_page)
+        remaining = math.ceil((self.total - self.offset) / self.limit)
+        count = max(1, min(needed, remaining, max_pages))
+        return [self.offset + i * self.limit for i in range(count)]
+
+    def result(self) -> EbaySearchResult:
+        # Troncature en place: pas de copie de la liste d'items
+        del self.items[self.max_items:]
+        return EbaySearchResult(
+            total=self.total,
+            items=self.items,
+            offset=0,
+            limit=self.max_items,
+        )
+
+
 class EbayClient:
     """Client pour l'API eBay Browse."""
 
@@ -79,10 +324,101 @@ class EbayClient:
         if config is None:
             config = get_config().ebay
         self.config = config
+        # Credentials fixes (config figee): header Basic calcule une fois
+        credentials = f"{config.client_id}:{config.client_secret}"
+        self._auth_header = f"Basic {base64.b64encode(credentials.encode()).decode()}"
         self._access_token: Optional[str] = None
         self._token_expires_at: float = 0
+        self._token_lock = threading.Lock()
         self._on_api_call = on_api_call
         self._call_count = 0  # Compteur de session
+        # Client HTTP persistant (keep-alive: une seule poignee de main TLS),
+        # cree au premier appel et partage par les threads de collecte
+        self._http: Optional[httpx.Client] = None
+        self._http_lock = threading.Lock()
+        # Pendant asynchrone: par thread, une boucle asyncio persistante et un
+        # AsyncClient lie a cette boucle (les connexions survivent d'un appel
+        # a search_all au suivant)
+        self._async_local = threading.local()
+        self._async_clients: list[tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = []
+        self._async_loops: list[asyncio.AbstractEventLoop] = []
+        # getItems indisponible pour ce compte (400/403/404): verification unitaire
+        self._batch_items_enabled = True
+
+    def _client(self) -> httpx.Client:
+        """Retourne le client HTTP partage (cree a la demande)."""
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    self._http = httpx.Client(
+                        http2=_HTTP2,
+                        timeout=10.0,
+                        limits=httpx.Limits(max_keepalive_connections=20, max_connections=20),
+                        headers={
+                            "X-EBAY-C-MARKETPLACE-ID": self.config.marketplace_id,
+                            "Content-Type": "application/json",
+                        },
+                    )
+        return self._http
+
+    def _async_client(self) -> httpx.AsyncClient:
+        """Client HTTP asynchrone du thread courant, lie a la boucle en cours."""
+        loop = asyncio.get_running_loop()
+        local = self._async_local
+        if getattr(local, "client_loop", None) is not loop:
+            local.client = httpx.AsyncClient(
+                http2=_HTTP2,
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=max(self.MAX_CONCURRENT_PAGES, self.MAX_CONCURRENT_ITEMS)),
+                headers={
+                    "X-EBAY-C-MARKETPLACE-ID": self.config.marketplace_id,
+                    "Content-Type": "application/json",
+                },
+            )
+            local.client_loop = loop
+            with self._http_lock:
+                # Oublie les clients des boucles deja fermees (asyncio.run cote appelant)
+                self._async_clients = [
+                    (client_loop, client) for client_loop, client in self._async_clients
+                    if not client_loop.is_closed()
+                ]
+                self._async_clients.append((loop, local.client))
+        return local.client
+
+    def _run_async(self, coro):
+        """Execute une coroutine sur la boucle persistante du thread courant."""
+        local = self._async_local
+        loop = getattr(local, "loop", None)
+        if loop is None or loop.is_closed():
+            loop = local.loop = asyncio.new_event_loop()
+            with self._http_lock:
+                self._async_loops.append(loop)
+        return loop.run_until_complete(coro)
+
+    def close(self) -> None:
+        """Ferme les connexions HTTP ouvertes."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+        with self._http_lock:
+            async_clients, self._async_clients = self._async_clients, []
+            loops, self._async_loops = self._async_loops, []
+        for loop, client in async_clients:
+            # Les clients des boucles de l'appelant (search_all_async) ne peuvent
+            # etre fermes que depuis ces boucles; seuls ceux des notres le sont ici
+            if loop in loops and not loop.is_closed() and not loop.is_running():
+                loop.run_until_complete(client.aclose())
+        for loop in loops:
+            if not loop.is_closed() and not loop.is_running():
+                loop.close()
+        self._async_local = threading.local()
+
+    def __enter__(self) -> "EbayClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
     def _track_api_call(self, count: int = 1) -> None:
         """Enregistre un ou plusieurs appels API."""
@@ -95,50 +431,159 @@ class EbayClient:
         """Nombre d'appels API effectues dans cette session."""
         return self._call_count
 
-    def _get_auth_header(self) -> str:
-        """Genere le header d'authentification Basic."""
-        credentials = f"{self.config.client_id}:{self.config.client_secret}"
-        encoded = base64.b64encode(credentials.encode()).decode()
-        return f"Basic {encoded}"
+    # Renouvellement anticipe du token (secondes avant l'expiration annoncee):
+    # les requetes ne tombent pas sur un 401 a la limite de validite
+    TOKEN_REFRESH_MARGIN = 300
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=_BACKOFF,
+        retry=retry_if_exception_type(httpx.TransportError),
+        reraise=True,
+    )
     def _refresh_token(self) -> None:
         """Obtient un nouveau token OAuth2."""
-        with httpx.Client(timeout=10.0) as client:
-            response = client.post(
-                self.config.auth_url,
-                headers={
-                    "Authorization": self._get_auth_header(),
-                    "Content-Type": "application/x-www-form-urlencoded",
-                },
-                data={
-                    "grant_type": "client_credentials",
-                    "scope": "https://api.ebay.com/oauth/api_scope",
-                },
-            )
-
-            if response.status_code != 200:
-                raise EbayAuthError(f"Auth failed: {response.status_code} - {response.text}")
+        response = self._client().post(
+            self.config.auth_url,
+            headers={
+                "Authorization": self._auth_header,
+                "Content-Type": "application/x-www-form-urlencoded",
+            },
+            data={
+                "grant_type": "client_credentials",
+                "scope": "https://api.ebay.com/oauth/api_scope",
+            },
+        )
 
-            data = response.json()
-            self._access_token = data["access_token"]
-            # Expire un peu avant pour etre safe
-            expires_in = data.get("expires_in", 7200)
-            self._token_expires_at = time.time() + expires_in - 60
+        if response.status_code != 200:
+            raise EbayAuthError(f"Auth failed: {response.status_code} - {response.text}")
+
+        data = _response_json(response)
+        self._access_token = data["access_token"]
+        # Expire un peu avant pour etre safe
+        expires_in = data.get("expires_in", 7200)
+        self._token_expires_at = time.time() + expires_in - self.TOKEN_REFRESH_MARGIN
+
+        # Partage avec les autres clients du process et, si configure, les
+        # prochaines commandes
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE[self.config.client_id] = (self._access_token, self._token_expires_at)
+            if self.config.token_cache_path:
+                _write_token_file(
+                    self.config.token_cache_path, self.config.client_id,
+                    self._access_token, self._token_expires_at,
+                )
+
+    def _load_cached_token(self) -> bool:
+        """Reprend un token encore valide obtenu par un autre client (memoire
+        puis fichier de cache). Retourne True si un token a ete repris."""
+        with _TOKEN_CACHE_LOCK:
+            cached = _TOKEN_CACHE.get(self.config.client_id)
+            if (cached is None or time.time() >= cached[1]) and self.config.token_cache_path:
+                cached = _read_token_file(self.config.token_cache_path, self.config.client_id)
+                if cached is not None:
+                    _TOKEN_CACHE[self.config.client_id] = cached
+        if cached is None or time.time() >= cached[1] or cached[0] == self._access_token:
+            return False
+        self._access_token, self._token_expires_at = cached
+        return True
 
     def _ensure_token(self) -> str:
-        """S'assure qu'on a un token valide."""
+        """S'assure qu'on a un token valide.
+
+        Un seul thread de collecte renouvelle le token; les autres attendent
+        le verrou puis reutilisent le nouveau token. Un token deja obtenu par
+        un autre client (ou une commande precedente) est repris sans appel OAuth.
+        """
         if self._access_token is None or time.time() >= self._token_expires_at:
-            self._refresh_token()
+            with self._token_lock:
+                if self._access_token is None or time.time() >= self._token_expires_at:
+                    if not self._load_cached_token():
+                        self._refresh_token()
+        return self._access_token  # type: ignore
+
+    def _renew_token(self, rejected_token: Optional[str]) -> str:
+        """Renouvelle le token apres un 401.
+
+        Sous le verrou de _ensure_token: quand plusieurs requetes recoivent un
+        401 pour le meme token, une seule appelle OAuth; les autres reprennent
+        le token deja renouvele.
+        """
+        with self._token_lock:
+            if self._access_token is None or self._access_token == rejected_token:
+                self._refresh_token()
         return self._access_token  # type: ignore
 
     def _get_headers(self) -> dict[str, str]:
-        """Headers pour les requetes API."""
+        """Headers pour les requetes API (marketplace et Content-Type sont
+        portes par le client HTTP)."""
         token = self._ensure_token()
-        return {
-            "Authorization": f"Bearer {token}",
-            "X-EBAY-C-MARKETPLACE-ID": self.config.marketplace_id,
-            "Content-Type": "application/json",
-        }
+        return {"Authorization": f"Bearer {token}"}
+
+    async def _ensure_token_async(self) -> str:
+        """_ensure_token sans bloquer la boucle: l'appel OAuth eventuel (et
+        l'attente du verrou) passent par un thread."""
+        if self._access_token is None or time.time() >= self._token_expires_at:
+            return await asyncio.to_thread(self._ensure_token)
+        return self._access_token
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=_retry_wait,
+        retry=retry_if_exception_type((httpx.TransportError, _RetryableStatus)),
+        retry_error_callback=_last_response,
+    )
+    def _request(self, method: str, url: str, track: bool = True, **kwargs) -> httpx.Response:
+        """Requete authentifiee sur le client partage.
+
+        Un 401 renouvelle le token et rejoue la requete; les erreurs reseau
+        et les statuts transitoires (502-504) sont reessayes avec backoff.
+
+        Args:
+            track: Compter l'appel dans le quota Browse API
+        """
+        client = self._client()
+        token = self._ensure_token()
+        response = client.request(method, url, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+        if track:
+            self._track_api_call(1)
+
+        if response.status_code == 401:
+            # Token expire, refresh et retry
+            token = self._renew_token(token)
+            response = client.request(method, url, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+            if track:
+                self._track_api_call(1)
+
+        if response.status_code in _RETRYABLE_STATUS:
+            raise _RetryableStatus(response)
+        return response
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=_retry_wait,
+        retry=retry_if_exception_type((httpx.TransportError, _RetryableStatus)),
+        retry_error_callback=_last_response,
+    )
+    async def _request_async(self, method: str, url: str, track: bool = True, **kwargs) -> httpx.Response:
+        """Equivalent asynchrone de _request (memes reessais, meme gestion du 401),
+        sur l'AsyncClient du thread courant."""
+        client = self._async_client()
+        token = await self._ensure_token_async()
+        response = await client.request(method, url, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+        if track:
+            self._track_api_call(1)
+
+        if response.status_code == 401:
+            # Token expire: renouvellement unique (verrou) hors de la boucle
+            token = await asyncio.to_thread(self._renew_token, token)
+            response = await client.request(method, url, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+            if track:
+                self._track_api_call(1)
+
+        if response.status_code in _RETRYABLE_STATUS:
+            raise _RetryableStatus(response)
+        return response
 
     # Mots a exclure dans les titres (lots, etc.) - SANS les graded
     TITLE_EXCLUSIONS_BASE = [
@@ -190,6 +635,13 @@ class EbayClient:
     # Par defaut: exclure Edition 1
     TITLE_EXCLUSIONS = TITLE_EXCLUSIONS_BASE + EDITION1_KEYWORDS
 
+    # Listes de mots-cles precompilees (un seul passage en C sur le titre au
+    # lieu d'un test "in" par mot-cle)
+    _EXCLUSIONS = _KeywordMatcher(TITLE_EXCLUSIONS_BASE, TITLE_EXCLUSIONS_REGEX)
+    _GRADED = _KeywordMatcher(GRADED_KEYWORDS)
+    _EDITION1 = _KeywordMatcher(EDITION1_KEYWORDS)
+    _EDITION2 = _KeywordMatcher(EDITION2_KEYWORDS)
+
     def search(
         self,
         query: str,
@@ -224,6 +676,38 @@ class EbayClient:
         Returns:
             EbaySearchResult avec les items trouves
         """
+        url, params = self._search_request(
+            query, limit, offset, category_ids, condition_ids,
+            item_location_country, delivery_country, buying_options,
+        )
+
+        response = self._request("GET", url, params=params)
+
+        return self._parse_search_response(
+            response, limit, offset, filter_titles, is_first_edition,
+            is_reverse, is_graded, card_number, card_number_full,
+        )
+
+    # Format de chaque filtre Browse API (listes entre accolades)
+    _FILTER_FORMATS = {
+        "conditionIds": "conditionIds:{{{}}}",
+        "itemLocationCountry": "itemLocationCountry:{}",
+        "deliveryCountry": "deliveryCountry:{}",
+        "buyingOptions": "buyingOptions:{{{}}}",
+    }
+
+    def _search_request(
+        self,
+        query: str,
+        limit: int = 50,
+        offset: int = 0,
+        category_ids: Optional[list[str]] = None,
+        condition_ids: Optional[list[str]] = None,
+        item_location_country: Optional[str] = None,
+        delivery_country: Optional[str] = None,
+        buying_options: Optional[list[str]] = None,
+    ) -> tuple[str, dict[str, Any]]:
+        """URL et parametres d'une recherche Browse API."""
         url = f"{self.config.api_base_url}/buy/browse/v1/item_summary/search"
 
         params: dict[str, Any] = {
@@ -232,44 +716,45 @@ class EbayClient:
             "offset": offset,
         }
 
-        # Construire les filtres
-        filters = []
-
         if category_ids:
             params["category_ids"] = ",".join(category_ids)
 
-        if condition_ids:
-            filters.append(f"conditionIds:{{{','.join(condition_ids)}}}")
-
-        if item_location_country:
-            filters.append(f"itemLocationCountry:{item_location_country}")
-
-        if delivery_country:
-            filters.append(f"deliveryCountry:{delivery_country}")
-
-        if buying_options:
-            filters.append(f"buyingOptions:{{{','.join(buying_options)}}}")
-
+        # Construire les filtres (un seul passage sur la table des formats)
+        filters = [
+            self._FILTER_FORMATS[name].format(",".join(value) if isinstance(value, list) else value)
+            for name, value in (
+                ("conditionIds", condition_ids),
+                ("itemLocationCountry", item_location_country),
+                ("deliveryCountry", delivery_country),
+                ("buyingOptions", buying_options),
+            )
+            if value
+        ]
         if filters:
             params["filter"] = ",".join(filters)
 
-        with httpx.Client(timeout=10.0) as client:
-            response = client.get(url, headers=self._get_headers(), params=params)
-            self._track_api_call(1)
-
-            if response.status_code == 401:
-                # Token expire, refresh et retry
-                self._refresh_token()
-                response = client.get(url, headers=self._get_headers(), params=params)
-                self._track_api_call(1)
+        return url, params
 
-            if response.status_code == 429:
-                raise EbayRateLimitError("Rate limit exceeded (429)")
+    def _parse_search_response(
+        self,
+        response: httpx.Response,
+        limit: int,
+        offset: int,
+        filter_titles: bool = True,
+        is_first_edition: bool = False,
+        is_reverse: Optional[bool] = None,
+        is_graded: Optional[bool] = None,
+        card_number: Optional[str] = None,
+        card_number_full: Optional[str] = None,
+    ) -> EbaySearchResult:
+        """Verifie le statut HTTP d'une recherche et parse ses items."""
+        if response.status_code == 429:
+            raise EbayRateLimitError("Rate limit exceeded (429)")
 
-            if response.status_code != 200:
-                raise EbayAPIError(f"Search failed: {response.status_code} - {response.text}")
+        if response.status_code != 200:
+            raise EbayAPIError(f"Search failed: {response.status_code} - {response.text}")
 
-            data = response.json()
+        data = _response_json(response)
 
         # Parser les resultats
         result = EbaySearchResult(
@@ -278,14 +763,19 @@ class EbayClient:
             limit=data.get("limit", limit),
         )
 
+        # Numero de carte analyse une fois pour toute la page
+        number_matcher = _build_card_number_matcher(card_number, card_number_full)
+
         for item_data in data.get("itemSummaries", []):
+            # Filtrer les titres indesirables avant de parser l'item (lots,
+            # graded... sont frequents: inutile de les construire)
+            if filter_titles and self._should_exclude_title(
+                item_data.get("title", ""), is_first_edition, is_reverse, is_graded,
+                number_matcher=number_matcher,
+            ):
+                continue
             item = self._parse_item(item_data)
             if item:
-                # Filtrer les titres indesirables
-                if filter_titles and self._should_exclude_title(
-                    item.title, is_first_edition, is_reverse, is_graded, card_number, card_number_full
-                ):
-                    continue
                 result.items.append(item)
 
         # Warnings
@@ -304,15 +794,47 @@ class EbayClient:
         is_reverse: Optional[bool] = None,
         is_graded: Optional[bool] = None,
         card_number: Optional[str] = None,
-        card_number_full: Optional[str] = None
+        card_number_full: Optional[str] = None,
+        number_matcher: Optional[_CardNumberMatcher] = None,
     ) -> bool:
-        """Verifie si le titre contient des mots a exclure."""
-        import re
+        """Verifie si le titre contient des mots a exclure.
+
+        number_matcher: matcher du numero deja construit par l'appelant
+        (_build_card_number_matcher), sinon deduit de card_number(_full).
+        """
+        if number_matcher is None and card_number and card_number_full:
+            number_matcher = _build_card_number_matcher(card_number, card_number_full)
+        return self._title_excluded(title, is_first_edition, is_reverse, is_graded, number_matcher)
+
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _title_excluded(
+        title: str,
+        is_first_edition: bool,
+        is_reverse: Optional[bool],
+        is_graded: Optional[bool],
+        number_matcher: Optional[_CardNumberMatcher],
+    ) -> bool:
+        """Pipeline d'exclusion de _should_exclude_title.
+
+        Memoise: les doublons entre pages et les titres recurrents d'une
+        collecte a l'autre ne repassent pas par les regex.
+
+        Ordre des tests: les plus selectifs et les moins chers d'abord (numero
+        de carte, marqueur reverse), les listes de mots-cles ensuite. Chaque
+        test ne peut qu'exclure: l'ordre ne change pas le resultat.
+        """
+        # Verifier le numero de carte si fourni ET si on a un card_number_full
+        # Si card_number_full est None (promo, cartes speciales), ne pas filtrer sur le numero
+        # Exclure l'annonce si le numero n'apparait pas dans le titre (cas le plus frequent)
+        if number_matcher is not None and number_matcher.search(title) is None:
+            return True
+
         title_lower = title.lower()
 
         # Filtrage REVERSE / NORMAL (None = pas de filtre)
         if is_reverse is not None:
-            has_reverse = any(kw in title_lower for kw in self.REVERSE_KEYWORDS)
+            has_reverse = any(kw in title_lower for kw in EbayClient.REVERSE_KEYWORDS)
             if is_reverse:
                 # Pour REVERSE: exclure si pas de marqueur reverse
                 if not has_reverse:
@@ -324,7 +846,7 @@ class EbayClient:
 
         # Filtrage GRADED (None = pas de filtre, on garde tout pour tri ulterieur)
         if is_graded is not None:
-            has_graded = any(kw in title_lower for kw in self.GRADED_KEYWORDS)
+            has_graded = EbayClient._GRADED.search(title_lower)
             if is_graded:
                 # Pour GRADED: exclure si pas de marqueur graded
                 if not has_graded:
@@ -334,120 +856,71 @@ class EbayClient:
                 if has_graded:
                     return True
 
-        # Exclusions de base (lots, etc.)
-        for exclusion in self.TITLE_EXCLUSIONS_BASE:
-            if exclusion in title_lower:
-                return True
-
-        # Exclusions regex (mots complets)
-        for pattern in self.TITLE_EXCLUSIONS_REGEX:
-            if re.search(pattern, title_lower):
-                return True
+        # Exclusions de base (lots, etc.) et regex (mots complets)
+        if EbayClient._EXCLUSIONS.search(title_lower):
+            return True
 
         if is_first_edition:
             # Pour Edition 1: exclure les Edition 2 / Unlimited
-            for exclusion in self.EDITION2_KEYWORDS:
-                if exclusion in title_lower:
-                    return True
+            if EbayClient._EDITION2.search(title_lower):
+                return True
             # Verifier que c'est bien une Edition 1
-            has_ed1_marker = any(kw in title_lower for kw in self.EDITION1_KEYWORDS)
-            if not has_ed1_marker:
+            if not EbayClient._EDITION1.search(title_lower):
                 return True  # Exclure si pas de marqueur Edition 1
         else:
             # Pour Normal: exclure les Edition 1
-            for exclusion in self.EDITION1_KEYWORDS:
-                if exclusion in title_lower:
-                    return True
-
-        # Verifier le numero de carte si fourni ET si on a un card_number_full
-        # Si card_number_full est None (promo, cartes speciales), ne pas filtrer sur le numero
-        if card_number and card_number_full:
-            # Le numero doit apparaitre dans le titre, precede d'un non-chiffre
-            # Ex: "1/102" doit matcher "1/102" mais pas "21/102" ou "1" dans "Edition 1"
-
-            if "/" in card_number_full:
-                num, total = card_number_full.split("/")
-
-                # Verifier si le numero est purement numerique ou alphanumerique (ex: SL7)
-                if num.isdigit():
-                    # Format numerique classique X/Y
-                    # Enlever les zeros de padding pour la comparaison flexible
-                    num_stripped = num.lstrip('0') or '0'
-                    total_stripped = total.lstrip('0') or '0'
-                    # Pattern: X/Y avec X non precede d'un chiffre, zeros optionnels
-                    # Accepte 039/094, 39/94, 039/94, etc.
-                    pattern = rf'(?<![0-9])0*{re.escape(num_stripped)}\s*/\s*0*{re.escape(total_stripped)}'
-                    if re.search(pattern, title):
-                        return False  # Numero trouve, ne pas exclure
-                else:
-                    # Format alphanumerique (ex: SL7/95, TG01/30)
-                    # Chercher juste le numero (SL7) sans le total, insensible a la casse
-                    # Pattern: le numero alphanumerique comme mot distinct
-                    pattern = rf'(?i)\b{re.escape(num)}\b'
-                    if re.search(pattern, title):
-                        return False  # Numero trouve, ne pas exclure
-            else:
-                # Format sans slash (rare mais possible)
-                # Pattern: numero precede d'un non-chiffre et suivi d'un non-chiffre
-                pattern = rf'(?<![0-9]){re.escape(card_number)}(?![0-9])'
-                if re.search(pattern, title):
-                    return False  # Numero trouve
-
-            # Si le pattern n'a pas ete trouve, exclure l'annonce
-            return True
+            if EbayClient._EDITION1.search(title_lower):
+                return True
 
         return False
 
     def _parse_item(self, data: dict) -> Optional[EbayItem]:
         """Parse un item depuis la reponse API."""
+        get = data.get  # Appele une douzaine de fois par item
         try:
-            price_data = data.get("price", {})
+            price_data = get("price", {})
             price = float(price_data.get("value", 0))
             currency = price_data.get("currency", "EUR")
 
             # Shipping
             shipping_cost = None
             shipping_currency = None
-            shipping_options = data.get("shippingOptions", [])
+            shipping_options = get("shippingOptions")
             if shipping_options:
-                shipping_data = shipping_options[0].get("shippingCost", {})
+                shipping_data = shipping_options[0].get("shippingCost")
                 if shipping_data:
                     shipping_cost = float(shipping_data.get("value", 0))
                     shipping_currency = shipping_data.get("currency", currency)
 
-            # Condition
-            condition = data.get("condition")
-            condition_id = data.get("conditionId")
-
             # Image
-            image = data.get("image", {})
+            image = get("image")
             image_url = image.get("imageUrl") if image else None
 
             # Seller
-            seller = data.get("seller", {})
+            seller = get("seller")
             seller_username = seller.get("username") if seller else None
 
-            # Date de mise en vente
-            listing_date = data.get("itemCreationDate")
-
             return EbayItem(
-                item_id=data.get("itemId", ""),
-                title=data.get("title", ""),
+                item_id=get("itemId", ""),
+                title=get("title", ""),
                 price=price,
                 currency=currency,
                 shipping_cost=shipping_cost,
                 shipping_currency=shipping_currency,
-                condition=condition,
-                condition_id=condition_id,
+                condition=get("condition"),
+                condition_id=get("conditionId"),
                 image_url=image_url,
-                item_web_url=data.get("itemWebUrl"),
+                item_web_url=get("itemWebUrl"),
                 seller_username=seller_username,
-                listing_date=listing_date,
+                listing_date=get("itemCreationDate"),  # Date de mise en vente
             )
         except (ValueError, KeyError) as e:
             # Item mal forme, on skip
             return None
 
+    # Pages au-dela de la premiere recuperees en parallele (borne les appels simultanes)
+    MAX_CONCURRENT_PAGES = 10
+
     def search_all(
         self,
         query: str,
@@ -461,6 +934,9 @@ class EbayClient:
         """
         Recherche avec pagination automatique.
 
+        La premiere page (client HTTP persistant) donne le total; les pages
+        suivantes, quand il en faut, sont recuperees en parallele.
+
         Args:
             query: Requete de recherche
             max_items: Nombre max d'items a recuperer
@@ -469,38 +945,141 @@ class EbayClient:
         Returns:
             EbaySearchResult avec tous les items
         """
-        all_items: list[EbayItem] = []
-        offset = 0
-        limit = min(max_items, 200)
-        total = 0
-
-        while len(all_items) < max_items:
-            result = self.search(
-                query, limit=limit, offset=offset,
-                is_first_edition=is_first_edition,
-                is_reverse=is_reverse,
-                card_number=card_number,
-                card_number_full=card_number_full,
-                **kwargs
-            )
-            total = result.total
+        search_kwargs = dict(
+            is_first_edition=is_first_edition,
+            is_reverse=is_reverse,
+            card_number=card_number,
+            card_number_full=card_number_full,
+            **kwargs
+        )
+        pages = _SearchPages(max_items)
 
-            if not result.items:
-                break
+        if max_items > 0:
+            first = self.search(query, limit=pages.limit, offset=0, **search_kwargs)
+            if pages.add(first):
+                self._run_async(self._fetch_pages_async(query, pages, search_kwargs))
 
-            all_items.extend(result.items)
-            offset += limit  # Must increment by limit, not filtered count
+        return pages.result()
 
-            if offset >= total:
-                break
+    async def search_all_async(
+        self,
+        query: str,
+        max_items: int = 100,
+        is_first_edition: bool = False,
+        is_reverse: Optional[bool] = None,
+        card_number: Optional[str] = None,
+        card_number_full: Optional[str] = None,
+        **kwargs
+    ) -> EbaySearchResult:
+        """Version asynchrone de search_all (appelants deja dans une boucle asyncio)."""
+        search_kwargs = dict(
+            is_first_edition=is_first_edition,
+            is_reverse=is_reverse,
+            card_number=card_number,
+            card_number_full=card_number_full,
+            **kwargs
+        )
+        pages = _SearchPages(max_items)
 
-        return EbaySearchResult(
-            total=total,
-            items=all_items[:max_items],
-            offset=0,
-            limit=max_items,
+        if max_items > 0:
+            await self._fetch_pages_async(query, pages, search_kwargs)
+
+        return pages.result()
+
+    async def _fetch_pages_async(self, query: str, pages: "_SearchPages", search_kwargs: dict) -> None:
+        """Recupere les pages restantes par vagues concurrentes.
+
+        Les pages sont integrees dans l'ordre des offsets avec les memes regles
+        d'arret qu'une pagination sequentielle; une erreur n'est levee que si
+        la pagination sequentielle aurait atteint la page concernee.
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_PAGES)
+        while True:
+            offsets = pages.next_offsets(self.MAX_CONCURRENT_PAGES)
+            results = await asyncio.gather(
+                *(self._search_async(semaphore, query, pages.limit, offset, **search_kwargs)
+                  for offset in offsets),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+                if not pages.add(result):
+                    return
+
+    async def _search_async(
+        self,
+        semaphore: asyncio.Semaphore,
+        query: str,
+        limit: int,
+        offset: int,
+        category_ids: Optional[list[str]] = None,
+        condition_ids: Optional[list[str]] = None,
+        item_location_country: Optional[str] = None,
+        delivery_country: Optional[str] = None,
+        buying_options: Optional[list[str]] = None,
+        filter_titles: bool = True,
+        is_first_edition: bool = False,
+        is_reverse: Optional[bool] = None,
+        is_graded: Optional[bool] = None,
+        card_number: Optional[str] = None,
+        card_number_full: Optional[str] = None,
+    ) -> EbaySearchResult:
+        """Equivalent asynchrone de search() pour une page."""
+        url, params = self._search_request(
+            query, limit, offset, category_ids, condition_ids,
+            item_location_country, delivery_country, buying_options,
+        )
+
+        async with semaphore:
+            response = await self._request_async("GET", url, params=params)
+
+        return self._parse_search_response(
+            response, limit, offset, filter_titles, is_first_edition,
+            is_reverse, is_graded, card_number, card_number_full,
         )
 
+    @staticmethod
+    def _normalize_item_id(item_id: str) -> str:
+        """Normalise un item_id au format v1|xxx|0."""
+        if not item_id.startswith("v1|"):
+            return f"v1|{item_id}|0"
+        return item_id
+
+    @staticmethod
+    def _item_status(data: dict) -> dict:
+        """Statut d'une annonce depuis une reponse getItem/getItems."""
+        # Extraire les infos de disponibilite
+        availabilities = data.get("estimatedAvailabilities", [])
+        availability_status = "UNKNOWN"
+        sold_quantity = 0
+
+        if availabilities:
+            avail = availabilities[0]
+            availability_status = avail.get("estimatedAvailabilityStatus", "UNKNOWN")
+            sold_quantity = avail.get("estimatedSoldQuantity", 0)
+
+        # Determiner le statut final
+        item_end_date = data.get("itemEndDate")
+        price_data = data.get("price", {})
+
+        if availability_status == "OUT_OF_STOCK" and sold_quantity > 0:
+            status = "SOLD"
+        elif item_end_date:
+            # Annonce terminee mais pas vendue
+            status = "ENDED"
+        else:
+            status = "ACTIVE"
+
+        return {
+            "status": status,
+            "sold_quantity": sold_quantity,
+            "item_end_date": item_end_date,
+            "title": data.get("title"),
+            "price": float(price_data.get("value", 0)) if price_data else None,
+            "currency": price_data.get("currency", "EUR") if price_data else None,
+        }
+
     def get_item_status(self, item_id: str) -> dict:
         """
         Recupere le statut d'une annonce via l'API getItem.
@@ -517,60 +1096,127 @@ class EbayClient:
                 - price: prix
                 - error: message d'erreur (si ERROR)
         """
-        # Normaliser l'item_id au format v1|xxx|0
-        if not item_id.startswith("v1|"):
-            item_id = f"v1|{item_id}|0"
+        url = f"{self.config.api_base_url}/buy/browse/v1/item/{self._normalize_item_id(item_id)}"
+
+        try:
+            response = self._request("GET", url)
+
+            if response.status_code == 404:
+                return {"status": "NOT_FOUND", "sold_quantity": 0}
+
+            if response.status_code != 200:
+                return {"status": "ERROR", "error": f"HTTP {response.status_code}"}
+
+            return self._item_status(_response_json(response))
+
+        except Exception as e:
+            return {"status": "ERROR", "error": str(e)}
+
+    # Nombre max d'annonces par appel getItems (limite eBay)
+    ITEMS_PER_BATCH = 20
+    # Reponses de getItems signifiant que l'endpoint n'est pas utilisable ici
+    _BATCH_UNSUPPORTED_STATUS = frozenset({400, 403, 404})
+
+    def get_item_statuses(self, item_ids: list[str]) -> dict[str, dict]:
+        """
+        Recupere le statut de plusieurs annonces via getItems (20 par appel).
 
-        url = f"{self.config.api_base_url}/buy/browse/v1/item/{item_id}"
+        Les annonces absentes de la reponse groupee (introuvables, erreur) ou
+        d'un lot en echec sont reverifiees une par une via get_item_status.
+
+        Returns:
+            Dict item_id (tel que fourni) -> meme format que get_item_status
+        """
+        url = f"{self.config.api_base_url}/buy/browse/v1/item/"
+        unique_ids = list(dict.fromkeys(item_ids))
+        statuses: dict[str, dict] = {}
+
+        for start in range(0, len(unique_ids), self.ITEMS_PER_BATCH):
+            if not self._batch_items_enabled:
+                break
+            chunk = unique_ids[start:start + self.ITEMS_PER_BATCH]
+            by_normalized = {self._normalize_item_id(item_id): item_id for item_id in chunk}
+            params = {"item_ids": ",".join(by_normalized)}
+
+            try:
+                response = self._request("GET", url, params=params)
+            except httpx.TransportError:
+                continue  # Lot en echec reseau: repli unitaire
+
+            if response.status_code in self._BATCH_UNSUPPORTED_STATUS:
+                # Endpoint refuse (droits, marketplace...): inutile de payer
+                # un appel groupe en plus de chaque appel unitaire
+                self._batch_items_enabled = False
+                console.print(
+                    f"[yellow]eBay getItems indisponible (HTTP {response.status_code}), "
+                    f"verification unitaire des annonces[/yellow]"
+                )
+                break
+            if response.status_code != 200:
+                continue  # Erreur transitoire: repli unitaire pour ce lot
+
+            try:
+                items = _response_json(response).get("items", [])
+            except ValueError:
+                continue
+            for data in items:
+                item_id = by_normalized.get(data.get("itemId"))
+                if item_id is not None:
+                    try:
+                        statuses[item_id] = self._item_status(data)
+                    except (ValueError, TypeError):
+                        pass  # Reverifie unitairement ci-dessous
+
+        # Repli unitaire, en parallele quand il y a plusieurs annonces
+        missing = [item_id for item_id in unique_ids if item_id not in statuses]
+        if len(missing) > 1:
+            statuses.update(self._run_async(self.get_item_statuses_async(missing)))
+        elif missing:
+            statuses[missing[0]] = self.get_item_status(missing[0])
+
+        return statuses
+
+    # Appels getItem simultanes lors d'une verification unitaire en masse
+    MAX_CONCURRENT_ITEMS = 10
+
+    async def get_item_statuses_async(self, item_ids: list[str]) -> dict[str, dict]:
+        """
+        Recupere le statut de plusieurs annonces via getItem, en parallele.
+
+        Le nombre d'appels simultanes est borne par MAX_CONCURRENT_ITEMS.
+
+        Returns:
+            Dict item_id (tel que fourni) -> meme format que get_item_status
+        """
+        unique_ids = list(dict.fromkeys(item_ids))
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_ITEMS)
+        results = await asyncio.gather(
+            *(self.get_item_status_async(item_id, semaphore) for item_id in unique_ids)
+        )
+        return dict(zip(unique_ids, results))
+
+    async def get_item_status_async(
+        self,
+        item_id: str,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> dict:
+        """Version asynchrone de get_item_status (meme format de retour)."""
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(1)
+
+        url = f"{self.config.api_base_url}/buy/browse/v1/item/{self._normalize_item_id(item_id)}"
 
         try:
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(url, headers=self._get_headers())
-                self._track_api_call(1)
+            async with semaphore:
+                response = await self._request_async("GET", url)
+
+            if response.status_code == 404:
+                return {"status": "NOT_FOUND", "sold_quantity": 0}
+
+            if response.status_code != 200:
+                return {"status": "ERROR", "error": f"HTTP {response.status_code}"}
 
-                if response.status_code == 401:
-                    self._refresh_token()
-                    response = client.get(url, headers=self._get_headers())
-                    self._track_api_call(1)
-
-                if response.status_code == 404:
-                    return {"status": "NOT_FOUND", "sold_quantity": 0}
-
-                if response.status_code != 200:
-                    return {"status": "ERROR", "error": f"HTTP {response.status_code}"}
-
-                data = response.json()
-
-                # Extraire les infos de disponibilite
-                availabilities = data.get("estimatedAvailabilities", [])
-                availability_status = "UNKNOWN"
-                sold_quantity = 0
-
-                if availabilities:
-                    avail = availabilities[0]
-                    availability_status = avail.get("estimatedAvailabilityStatus", "UNKNOWN")
-                    sold_quantity = avail.get("estimatedSoldQuantity", 0)
-
-                # Determiner le statut final
-                item_end_date = data.get("itemEndDate")
-                price_data = data.get("price", {})
-
-                if availability_status == "OUT_OF_STOCK" and sold_quantity > 0:
-                    status = "SOLD"
-                elif item_end_date:
-                    # Annonce terminee mais pas vendue
-                    status = "ENDED"
-                else:
-                    status = "ACTIVE"
-
-                return {
-                    "status": status,
-                    "sold_quantity": sold_quantity,
-                    "item_end_date": item_end_date,
-                    "title": data.get("title"),
-                    "price": float(price_data.get("value", 0)) if price_data else None,
-                    "currency": price_data.get("currency", "EUR") if price_data else None,
-                }
+            return self._item_status(_response_json(response))
 
         except Exception as e:
             return {"status": "ERROR", "error": str(e)}
@@ -589,32 +1235,34 @@ class EbayClient:
         }
 
         try:
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(url, headers=self._get_headers(), params=params)
-
-                if response.status_code == 401:
-                    self._refresh_token()
-                    response = client.get(url, headers=self._get_headers(), params=params)
-
-                if response.status_code != 200:
-                    return None
-
-                data = response.json()
-
-                # Parser la reponse pour trouver les infos de browse API
-                for rate_limit in data.get("rateLimits", []):
-                    if rate_limit.get("apiName", "").lower() == "browse":
-                        for resource in rate_limit.get("resources", []):
-                            rates = resource.get("rates", [])
-                            if rates:
-                                rate = rates[0]
-                                return {
-                                    "count": rate.get("count", 0),
-                                    "limit": rate.get("limit", 5000),
-                                    "remaining": rate.get("remaining", 5000),
-                                    "reset": rate.get("reset"),  # ISO 8601
-                                    "time_window": rate.get("timeWindow"),
-                                }
+            # Endpoint Analytics: hors quota Browse API
+            response = self._request("GET", url, track=False, params=params)
+
+            if response.status_code != 200:
+                return None
+
+            data = _response_json(response)
+
+            # Premier taux de la premiere ressource browse qui en a un
+            rate = next(
+                (
+                    rates[0]
+                    for rate_limit in data.get("rateLimits", ())
+                    if rate_limit.get("apiName", "").lower() == "browse"
+                    for resource in rate_limit.get("resources", ())
+                    if (rates := resource.get("rates"))
+                ),
+                None,
+            )
+            if rate is None:
                 return None
+
+            return {
+                "count": rate.get("count", 0),
+                "limit": rate.get("limit", 5000),
+                "remaining": rate.get("remaining", 5000),
+                "reset": rate.get("reset"),  # ISO 8601
+                "time_window": rate.get("timeWindow"),
+            }
         except Exception:
             return None
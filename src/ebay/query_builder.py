@@ -8,6 +8,7 @@ Syntaxe eBay Browse API:
 """
 
 import re
+from functools import lru_cache
 from typing import Optional
 from ..models import Card, Variant, CardNumberFormat
 
@@ -21,6 +22,7 @@ class EbayQueryBuilder:
         Variant.HOLO: "holo",
         Variant.FIRST_ED: "edition 1",
     }
+    _FIRST_ED_KEYWORD = VARIANT_KEYWORDS[Variant.FIRST_ED]
 
     def __init__(self, language: str = "fr", french_only: bool = True):
         """
@@ -52,29 +54,29 @@ class EbayQueryBuilder:
         # 2. Numero de carte selon le format
         effective_local_id = card.effective_local_id
         effective_card_number_full = card.effective_card_number_full
-        card_format = card.card_number_format or CardNumberFormat.LOCAL_TOTAL
-
-        if card_format == CardNumberFormat.LOCAL_ONLY:
-            # Juste le numero
-            if effective_local_id:
-                parts.append(effective_local_id)
-
-        elif card_format == CardNumberFormat.PROMO:
-            # Numero + "promo"
-            if effective_local_id:
-                parts.append(effective_local_id)
-            parts.append("promo")
-
-        else:  # LOCAL_TOTAL (defaut)
-            # Numero complet X/Y
-            if effective_card_number_full:
-                parts.append(effective_card_number_full)
-            elif effective_local_id:
-                parts.append(effective_local_id)
+
+        match card.card_number_format:
+            case CardNumberFormat.LOCAL_ONLY:
+                # Juste le numero
+                if effective_local_id:
+                    parts.append(effective_local_id)
+
+            case CardNumberFormat.PROMO:
+                # Numero + "promo"
+                if effective_local_id:
+                    parts.append(effective_local_id)
+                parts.append("promo")
+
+            case _:  # LOCAL_TOTAL (defaut)
+                # Numero complet X/Y
+                if effective_card_number_full:
+                    parts.append(effective_card_number_full)
+                elif effective_local_id:
+                    parts.append(effective_local_id)
 
         # 3. Seulement Edition 1 (pas holo, pas reverse, pas normal)
         if card.variant == Variant.FIRST_ED:
-            parts.append(self.VARIANT_KEYWORDS[Variant.FIRST_ED])
+            parts.append(self._FIRST_ED_KEYWORD)
 
         # Construire la requete
         query = " ".join(parts)
@@ -103,33 +105,41 @@ class EbayQueryBuilder:
         '™',  # Trademark
     ]
 
-    def _clean_name(self, name: str) -> str:
-        """Nettoie le nom de la carte."""
-        # Retirer les guillemets doubles (problematiques pour eBay)
-        name = name.replace('"', '')
-        # Garder les apostrophes (ex: "Double Suppression d'Énergie")
-        # Remplacer les tirets par des espaces
-        name = name.replace("-", " ")
-        # Supprimer les caracteres speciaux (δ, ☆, etc.)
-        for char in self.SPECIAL_CHARS:
-            name = name.replace(char, '')
+    # Table de traduction appliquee en un passage: guillemets doubles et
+    # caracteres speciaux supprimes, tirets remplaces par des espaces
+    _TRANSLATE_TABLE = str.maketrans({'"': None, "-": " ", **dict.fromkeys(SPECIAL_CHARS)})
+    _TEAM_RE = re.compile(r'\s+de\s+team\s+\w+', re.IGNORECASE)
+    _LEVEL_RE = re.compile(r'\s+niv[.\s]+\d+\s*$', re.IGNORECASE)
+    _MULTI_SPACE_RE = re.compile(r' {2,}')
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _clean_name(name: str) -> str:
+        """Nettoie le nom de la carte.
+
+        Memoise par nom: les variantes d'une meme carte (normal, reverse,
+        holo...) et la requete minimale partagent le meme nom nettoye.
+        """
+        # Retirer les guillemets doubles (problematiques pour eBay), remplacer
+        # les tirets par des espaces et supprimer les caracteres speciaux
+        # (δ, ☆, etc.). Les apostrophes sont gardees (ex: "Double Suppression d'Énergie")
+        name = name.translate(EbayQueryBuilder._TRANSLATE_TABLE)
 
         # Transformer "M " en debut de nom en "Mega " (ex: "M Rayquaza" -> "Mega Rayquaza")
-        # Note: "M-" est deja devenu "M " apres le replace("-", " ")
+        # Note: "M-" est deja devenu "M " apres la traduction des tirets
         if name.startswith("M "):
             name = "Mega " + name[2:]
 
         # Retirer "de Team X" du nom (ex: "Cacturne de Team Aqua" -> "Cacturne")
         # Note: seulement quand precede de "de", pas "Et voila les Team Rocket !"
-        name = re.sub(r'\s+de\s+team\s+\w+', '', name, flags=re.IGNORECASE)
+        name = EbayQueryBuilder._TEAM_RE.sub('', name)
 
         # Retirer "Niv. XX" ou "niv XX" en fin de nom (XX = chiffres)
         # MAIS garder "niv.X" et "NIV X" (niveau X = lettre X, cartes speciales)
-        name = re.sub(r'\s+niv[.\s]+\d+\s*$', '', name, flags=re.IGNORECASE)
+        name = EbayQueryBuilder._LEVEL_RE.sub('', name)
 
         # Nettoyer les espaces multiples
-        while '  ' in name:
-            name = name.replace('  ', ' ')
+        name = EbayQueryBuilder._MULTI_SPACE_RE.sub(' ', name)
         return name.strip()
 
     def _truncate_query(self, query: str) -> str:
@@ -161,9 +171,10 @@ class EbayQueryBuilder:
     def regenerate_all(self, cards: list[Card]) -> int:
         """Regenere les requetes pour une liste de cartes."""
         count = 0
+        generate = self.generate_for_card
         for card in cards:
             if not card.ebay_query_override:  # Ne pas ecraser les overrides
-                self.generate_for_card(card)
+                generate(card)
                 count += 1
         return count
 
@@ -8,7 +8,12 @@ import os
 from datetime import date, datetime, timedelta
 from typing import Optional
 
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
+try:
+    import orjson  # optionnel: decodage JSON plus rapide
+except ImportError:
+    orjson = None
 
 from ..models import ApiUsage
 from ..config import get_config
@@ -22,6 +27,33 @@ RATE_LIMITED_FILE = os.path.join(os.path.dirname(__file__), "../../data/ebay_rat
 # Heure de reset de l'API eBay (9h du matin heure locale)
 EBAY_RESET_HOUR = 9
 
+# Contenu des fichiers JSON deja lus: chemin -> ((mtime_ns, taille), donnees)
+_JSON_FILE_CACHE: dict[str, tuple[tuple[int, int], dict]] = {}
+
+
+def _read_json_file(path: str) -> Optional[dict]:
+    """Lit un fichier JSON (None s'il n'existe pas).
+
+    Le contenu est memorise tant que le mtime/taille du fichier ne changent
+    pas: le resume d'usage, relu a chaque affichage, ne reparse pas le fichier.
+    Les ecritures de ce module invalident l'entree (mtime a faible resolution).
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _JSON_FILE_CACHE.get(path)
+    if cached is None or cached[0] != key:
+        with open(path, "rb") as f:
+            raw = f.read()
+        cached = (key, orjson.loads(raw) if orjson is not None else json.loads(raw))
+        _JSON_FILE_CACHE[path] = cached
+
+    # Copie: l'appelant peut modifier le dict sans toucher au cache
+    return dict(cached[1])
+
 
 def get_ebay_api_date() -> date:
     """
@@ -50,10 +82,18 @@ class EbayUsageTracker:
         """
         self.session = session
         self.daily_limit = daily_limit or get_config().ebay.daily_limit
+        # Enregistrement du jour deja lu: (jour API, ligne)
+        self._today_cache: Optional[tuple[date, ApiUsage]] = None
 
     def _get_or_create_today(self) -> ApiUsage:
-        """Recupere ou cree l'enregistrement du jour API eBay (reset à 9h)."""
+        """Recupere ou cree l'enregistrement du jour API eBay (reset à 9h).
+
+        La ligne est memorisee pour le jour API courant: les getters appeles
+        a la suite (resume d'usage) ne relancent pas le meme SELECT.
+        """
         api_date = get_ebay_api_date()
+        if self._today_cache is not None and self._today_cache[0] == api_date:
+            return self._today_cache[1]
 
         usage = self.session.query(ApiUsage).filter(
             ApiUsage.api_name == self.API_NAME,
@@ -70,6 +110,7 @@ class EbayUsageTracker:
             self.session.add(usage)
             self.session.flush()
 
+        self._today_cache = (api_date, usage)
         return usage
 
     def increment(self, count: int = 1) -> ApiUsage:
@@ -79,13 +120,33 @@ class EbayUsageTracker:
         Args:
             count: Nombre d'appels a ajouter
 
+        Un seul upsert (INSERT ... ON CONFLICT DO UPDATE ... RETURNING) sur
+        l'index unique (api_name, usage_date): l'increment est fait par la
+        base, sans SELECT prealable ni lecture-modification-ecriture.
+
         Returns:
             L'enregistrement ApiUsage mis a jour
         """
-        usage = self._get_or_create_today()
-        usage.call_count += count
-        usage.daily_limit = self.daily_limit  # MAJ si config changee
-        self.session.flush()
+        api_date = get_ebay_api_date()
+        columns = ApiUsage.__table__.c
+        stmt = insert(ApiUsage).values(
+            api_name=self.API_NAME,
+            usage_date=api_date,
+            call_count=count,
+            daily_limit=self.daily_limit,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[columns.api_name, columns.usage_date],
+            set_={
+                "call_count": columns.call_count + stmt.excluded.call_count,
+                "daily_limit": stmt.excluded.daily_limit,  # MAJ si config changee
+                "updated_at": datetime.utcnow(),
+            },
+        ).returning(ApiUsage)
+        usage = self.session.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).one()
+        self._today_cache = (api_date, usage)
         return usage
 
     def get_today_usage(self) -> ApiUsage:
@@ -193,14 +254,13 @@ def save_rate_limits(rate_limits: dict) -> None:
             json.dump(data, f)
     except Exception:
         pass
+    _JSON_FILE_CACHE.pop(RATE_LIMITS_CACHE_FILE, None)
 
 
 def get_cached_rate_limits() -> Optional[dict]:
     """Recupere les rate limits depuis le cache."""
     try:
-        if os.path.exists(RATE_LIMITS_CACHE_FILE):
-            with open(RATE_LIMITS_CACHE_FILE, "r") as f:
-                return json.load(f)
+        return _read_json_file(RATE_LIMITS_CACHE_FILE)
     except Exception:
         pass
     return None
@@ -211,8 +271,8 @@ def refresh_rate_limits_from_ebay() -> Optional[dict]:
     from .client import EbayClient
 
     try:
-        client = EbayClient()
-        rate_limits = client.get_rate_limits()
+        with EbayClient() as client:
+            rate_limits = client.get_rate_limits()
         if rate_limits:
             save_rate_limits(rate_limits)
             return rate_limits
@@ -236,6 +296,7 @@ def set_rate_limited() -> None:
             json.dump(data, f)
     except Exception:
         pass
+    _JSON_FILE_CACHE.pop(RATE_LIMITED_FILE, None)
 
 
 def is_rate_limited() -> bool:
@@ -250,12 +311,10 @@ def is_rate_limited() -> bool:
         True si bloque, False sinon
     """
     try:
-        if not os.path.exists(RATE_LIMITED_FILE):
+        data = _read_json_file(RATE_LIMITED_FILE)
+        if data is None:
             return False
 
-        with open(RATE_LIMITED_FILE, "r") as f:
-            data = json.load(f)
-
         # Verifier que le blocage est pour le jour API actuel
         blocked_api_date = data.get("api_date")
         current_api_date = str(get_ebay_api_date())
@@ -313,8 +372,9 @@ def get_rate_limited_info() -> Optional[dict]:
         return None
 
     try:
-        with open(RATE_LIMITED_FILE, "r") as f:
-            data = json.load(f)
+        data = _read_json_file(RATE_LIMITED_FILE)
+        if data is None:
+            return None
 
         # Calculer le temps restant jusqu'a 9h
         now = datetime.now()
@@ -14,6 +14,24 @@ from ..models import Card, MarketSnapshot, AnchorSource, Variant
 from ..config import get_config, EbayConfig
 
 
+def _sorted_percentiles(sorted_arr: np.ndarray, fractions: np.ndarray) -> np.ndarray:
+    """Percentiles d'un tableau deja trie, sans le repartitionner.
+
+    Meme calcul que np.percentile(method="linear"): index virtuel (n-1)*q,
+    interpolation entre les deux voisins (formulee depuis le plus proche).
+    """
+    n = len(sorted_arr)
+    virtual = (n - 1) * fractions
+    previous = np.floor(virtual)
+    gamma = virtual - previous
+    lower = previous.astype(np.intp)
+    upper = np.minimum(lower + 1, n - 1)
+    a = sorted_arr[lower]
+    b = sorted_arr[upper]
+    diff = b - a
+    return np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+
+
 @dataclass
 class PriceStats:
     """Statistiques de prix calculees."""
@@ -84,6 +102,10 @@ class EbayWorker:
         self.client = EbayClient(config, on_api_call=on_api_call)
         self._fx_rates: dict[str, float] = {"EUR": 1.0, "USD": 0.92, "GBP": 1.17}
 
+    def close(self) -> None:
+        """Ferme les connexions HTTP du client eBay."""
+        self.client.close()
+
     def set_fx_rates(self, rates: dict[str, float]) -> None:
         """Definit les taux de change."""
         self._fx_rates = rates
@@ -269,24 +291,18 @@ class EbayWorker:
         Normalise les prix en EUR (hors frais de port).
 
         - Prix de base uniquement (sans port)
-        - Conversion en EUR
+        - Conversion en EUR (meme regle que _convert_to_eur, en ligne)
         - Filtrage des valeurs invalides
         """
-        prices = []
-
-        for item in items:
-            # Prix de base uniquement (hors port)
-            price = item.price
-            currency = item.currency
+        # Devise inconnue: taux 1.0, le prix est garde tel quel
+        rate = self._fx_rates.get
+        prices = [
+            item.price if item.currency == "EUR" else item.price * (rate(item.currency) or 1.0)
+            for item in items
+        ]
 
-            # Convertir en EUR
-            price_eur = self._convert_to_eur(price, currency)
-
-            # Filtrer valeurs invalides
-            if price_eur > 0:
-                prices.append(price_eur)
-
-        return prices
+        # Filtrer valeurs invalides
+        return [price for price in prices if price > 0]
 
     def _convert_to_eur(self, amount: float, currency: str) -> float:
         """Convertit un montant en EUR."""
@@ -298,6 +314,10 @@ class EbayWorker:
         # Devise inconnue, on garde tel quel (warning devrait etre log)
         return amount
 
+    # Percentiles calcules par _calculate_stats (ordre de l'affectation)
+    _PERCENTILES = (10, 20, 25, 50, 75, 80, 90)
+    _PERCENTILE_FRACTIONS = np.true_divide(_PERCENTILES, 100)
+
     def _calculate_stats(
         self,
         prices: list[float],
@@ -319,51 +339,44 @@ class EbayWorker:
         if not prices:
             return stats
 
-        # Tri pour le trimming
-        sorted_prices = sorted(prices)
+        # Tri pour le trimming (en place, directement en float64)
+        sorted_prices = np.array(prices, dtype=np.float64)
+        sorted_prices.sort()
         n = len(sorted_prices)
 
-        # Trimming: retirer top/bottom X%
+        # Trimming: retirer top/bottom X% (vue, sans copie)
         trim_bottom = int(n * self.config.trim_bottom_pct)
         trim_top = int(n * self.config.trim_top_pct)
 
         if trim_bottom + trim_top < n:
-            trimmed = sorted_prices[trim_bottom:n - trim_top if trim_top > 0 else n]
+            arr = sorted_prices[trim_bottom:n - trim_top]
         else:
-            trimmed = sorted_prices
+            arr = sorted_prices
 
-        stats.removed_count = raw_count - len(trimmed)
-        stats.sample_size = len(trimmed)
+        stats.removed_count = raw_count - len(arr)
+        stats.sample_size = len(arr)
 
-        if not trimmed:
+        if not len(arr):
             return stats
 
-        # Conversion en numpy pour les calculs
-        arr = np.array(trimmed)
-
-        # Percentiles classiques
-        stats.p20 = float(np.percentile(arr, 20))
-        stats.p50 = float(np.percentile(arr, 50))
-        stats.p80 = float(np.percentile(arr, 80))
-
-        # Nouveaux percentiles (bornes robustes)
-        stats.p10 = float(np.percentile(arr, 10))
-        stats.p90 = float(np.percentile(arr, 90))
+        # Percentiles classiques (p20, p50, p80), bornes robustes (p10, p90)
+        # et quartiles pour l'IQR: arr est deja trie, interpolation directe
+        stats.p10, stats.p20, p25, stats.p50, p75, stats.p80, stats.p90 = (
+            _sorted_percentiles(arr, self._PERCENTILE_FRACTIONS).tolist()
+        )
 
         # IQR (interquartile range)
-        p25 = float(np.percentile(arr, 25))
-        p75 = float(np.percentile(arr, 75))
         stats.iqr = p75 - p25
 
         # Dispersion
         if stats.p20 and stats.p20 > 0:
             stats.dispersion = stats.p80 / stats.p20
 
-        # Stats supplementaires
-        stats.mean = float(np.mean(arr))
-        stats.std = float(np.std(arr))
-        stats.min_price = float(np.min(arr))
-        stats.max_price = float(np.max(arr))
+        # Stats supplementaires (arr est trie: min/max aux extremites)
+        stats.mean = float(arr.mean())
+        stats.std = float(arr.std())
+        stats.min_price = float(arr[0])
+        stats.max_price = float(arr[-1])
 
         # CV (coefficient de variation) = std / mean
         if stats.mean and stats.mean > 0:
@@ -373,8 +386,8 @@ class EbayWorker:
         if stats.p50:
             lower_bound = stats.p50 * 0.8
             upper_bound = stats.p50 * 1.2
-            in_range = sum(1 for p in trimmed if lower_bound <= p <= upper_bound)
-            stats.consensus_score = (in_range / len(trimmed)) * 100
+            in_range = np.count_nonzero((arr >= lower_bound) & (arr <= upper_bound))
+            stats.consensus_score = (int(in_range) / len(arr)) * 100
 
         # Stats temporelles (age des annonces)
         if items:
@@ -599,13 +612,19 @@ class EbayWorker:
 
         return snapshot
 
+    # Cle des listings dans raw_meta et flag is_reverse, par variante
+    LISTING_VARIANTS = {
+        "normal": ("listings", False),
+        "reverse": ("reverse_listings", True),
+    }
+
     def detect_sold_listings(
         self,
         session,
         card: Card,
         new_snapshot: MarketSnapshot,
         previous_snapshot: Optional[MarketSnapshot],
-        is_reverse: bool = False,
+        variants: tuple[str, ...] = ("normal",),
         verify_via_api: bool = True
     ) -> list["SoldListing"]:
         """
@@ -619,7 +638,8 @@ class EbayWorker:
             card: La carte concernee
             new_snapshot: Le nouveau snapshot
             previous_snapshot: Le snapshot precedent (peut etre None)
-            is_reverse: True si on compare les listings reverse
+            variants: Listings a comparer, parmi "normal" et "reverse"
+                (raw_meta lu une seule fois pour toutes les variantes)
             verify_via_api: Si True, verifie le statut via l'API eBay
 
         Returns:
@@ -630,39 +650,53 @@ class EbayWorker:
         if not previous_snapshot:
             return []
 
-        # Extraire les listings des deux snapshots
-        key = "reverse_listings" if is_reverse else "listings"
         old_meta = previous_snapshot.get_raw_meta()
         new_meta = new_snapshot.get_raw_meta()
 
-        old_listings = old_meta.get(key, [])
-        new_listings = new_meta.get(key, [])
+        # Annonces disparues de chaque variante: (listing, is_reverse)
+        disappeared: list[tuple[dict, bool]] = []
+        for variant in variants:
+            key, is_reverse = self.LISTING_VARIANTS[variant]
+            old_listings = old_meta.get(key, [])
+            if not old_listings:
+                continue
 
-        if not old_listings:
+            # Creer un set des item_id actuels
+            current_ids = {item.get("item_id") for item in new_meta.get(key, []) if item.get("item_id")}
+            for listing in old_listings:
+                item_id = listing.get("item_id")
+                if item_id and item_id not in current_ids:
+                    disappeared.append((listing, is_reverse))
+
+        if not disappeared:
             return []
 
-        # Creer un set des item_id actuels
-        current_ids = {item.get("item_id") for item in new_listings if item.get("item_id")}
+        # Ventes deja enregistrees, en une requete
+        candidate_ids = {listing["item_id"] for listing, _ in disappeared}
+        known_ids = {
+            item_id for (item_id,) in session.query(SoldListing.item_id).filter(
+                SoldListing.item_id.in_(candidate_ids)
+            )
+        }
+
+        # Statuts eBay des annonces a verifier, par lots (getItems)
+        statuses: dict[str, dict] = {}
+        if verify_via_api:
+            statuses = self.client.get_item_statuses(
+                [listing["item_id"] for listing, _ in disappeared if listing["item_id"] not in known_ids]
+            )
 
-        # Trouver les disparus
         sold = []
-        for listing in old_listings:
-            item_id = listing.get("item_id")
-            if not item_id or item_id in current_ids:
-                continue
+        for listing, is_reverse in disappeared:
+            item_id = listing["item_id"]
 
             # Verifier si deja enregistre
-            existing = session.query(SoldListing).filter(
-                SoldListing.item_id == item_id
-            ).first()
-
-            if existing:
+            if item_id in known_ids:
                 continue
 
             # Verifier via API si reellement vendue
             if verify_via_api:
-                status_info = self.client.get_item_status(item_id)
-                status = status_info.get("status")
+                status = statuses[item_id].get("status")
 
                 # Ne creer que si vraiment vendue (OUT_OF_STOCK + soldQuantity > 0)
                 if status != "SOLD":
@@ -693,6 +727,7 @@ class EbayWorker:
                     session.add(sold_listing)
                     session.flush()
                 sold.append(sold_listing)
+                known_ids.add(item_id)
             except Exception:
                 # Doublon ou autre erreur - le savepoint est automatiquement rollback
                 # Continuer sans affecter les autres changements de la session
@@ -5,6 +5,7 @@ Tables: sets, cards, market_snapshots, buy_prices, batch_runs, fx_rates
 
 from datetime import datetime, date
 from enum import Enum as PyEnum
+from functools import lru_cache
 from typing import Optional
 import json
 
@@ -27,6 +28,25 @@ from sqlalchemy.orm import declarative_base, relationship
 Base = declarative_base()
 
 
+@lru_cache(maxsize=1024)
+def _pad_card_number_full(card_number_full: str) -> str:
+    """Numero complet avec padding a 3 chiffres: 2/90 -> 002/090.
+
+    Memoise par valeur: les cartes d'un meme set partagent le total, et
+    build_query relit le numero de chaque variante.
+    """
+    parts = card_number_full.split("/")
+    if len(parts) == 2:
+        local_id, total = parts
+        # Garde tel quel ce qui n'est pas numerique (ex: H01)
+        if local_id.isdigit():
+            local_id = local_id.zfill(3)
+        if total.isdigit():
+            total = total.zfill(3)
+        return f"{local_id}/{total}"
+    return card_number_full
+
+
 class Variant(PyEnum):
     """Variants de cartes Pokemon."""
     NORMAL = "NORMAL"
@@ -204,11 +224,8 @@ class Card(Base):
             return self.card_number_full_override
         # Sinon valeur TCGdex (avec padding si demande)
         if self.card_number_full and self.card_number_padded:
-            parts = self.card_number_full.split("/")
-            if len(parts) == 2:
-                local_id, total = parts[0], parts[1]
-                # Toujours 3 chiffres si padding active: 2/90 -> 002/090
-                return f"{self._pad_number(local_id, '000')}/{self._pad_number(total, '000')}"
+            # Toujours 3 chiffres si padding active: 2/90 -> 002/090
+            return _pad_card_number_full(self.card_number_full)
         return self.card_number_full
 
     def _pad_number(self, value: str, reference: str) -> str:
@@ -446,18 +463,41 @@ class BatchRun(Base):
     notes = Column(Text, nullable=True)
 
     # Resultats detailles (JSON) pour export CSV
-    # Format: [{"card_id": int, "tcgdex_id": str, "name": str, "set_id": str, "set_name": str, "status": str, "error": str|null}]
+    # Format: {"columns": {"card_id": [int], "tcgdex_id": [str], "name": [str], "set_id": [str],
+    #                      "set_name": [str], "status": [str], "error": [str|null]}}
+    # Ancien format (toujours lu): [{"card_id": int, "tcgdex_id": str, ...}]
     results_json = Column(Text, nullable=True)
 
+    # Champs des resultats par carte
+    RESULT_COLUMNS = ("card_id", "tcgdex_id", "name", "set_id", "set_name", "status", "error")
+
     def set_results(self, results: list[dict]) -> None:
-        """Stocke les resultats en JSON."""
-        self.results_json = json.dumps(results, ensure_ascii=False, default=str)
+        """Stocke les resultats (liste de lignes) en JSON."""
+        self.set_results_columns({key: [row.get(key) for row in results] for key in self.RESULT_COLUMNS})
+
+    def set_results_columns(self, columns: dict[str, list]) -> None:
+        """Stocke les resultats en JSON oriente colonnes (une liste par champ)."""
+        self.results_json = json.dumps({"columns": columns}, ensure_ascii=False, default=str)
+
+    def get_results_columns(self) -> dict[str, list]:
+        """Recupere les resultats par colonne (accepte l'ancien format liste)."""
+        if not self.results_json:
+            return {key: [] for key in self.RESULT_COLUMNS}
+        data = json.loads(self.results_json)
+        if isinstance(data, dict):
+            return data.get("columns", {})
+        return {key: [row.get(key) for row in data] for key in self.RESULT_COLUMNS}
 
     def get_results(self) -> list[dict]:
-        """Recupere les resultats depuis JSON."""
-        if self.results_json:
-            return json.loads(self.results_json)
-        return []
+        """Recupere les resultats depuis JSON (une ligne par carte)."""
+        if not self.results_json:
+            return []
+        data = json.loads(self.results_json)
+        if isinstance(data, list):
+            return data
+        columns = data.get("columns", {})
+        keys = list(columns)
+        return [dict(zip(keys, row)) for row in zip(*columns.values())]
 
     def __repr__(self) -> str:
         return f"<BatchRun {self.id} mode={self.mode.value}>"
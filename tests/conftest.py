@@ -0,0 +1,8 @@
+"""
+Configuration pytest: rend le package src importable depuis la racine du depot.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,62 @@
+"""
+Tests du BatchRunner (base SQLite temporaire, recherche eBay simulee).
+"""
+
+import pytest
+
+from src import config as config_module
+from src import database
+from src.batch import runner as runner_module
+from src.ebay.client import EbayClient, EbayItem, EbaySearchResult
+from src.models import BatchMode, Card, Set, Variant
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Base temporaire avec un set et des cartes sans requete eBay."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config.yaml").write_text(f"database:\n  db_path: {tmp_path / 'test.db'}\n")
+    config_module.reload_config(tmp_path / "config.yaml")
+    database.reset_engine()
+    database.init_db()
+
+    with database.get_session() as session:
+        session.add(Set(id="base1", name="Base", serie_id="base", serie_name="Base"))
+        for i in range(1, 8):
+            session.add(Card(
+                tcgdex_id=f"base1-{i}", set_id="base1", local_id=str(i), name=f"Pika{i}",
+                set_name="Base", card_number_full=f"{i}/100", variant=Variant.NORMAL,
+            ))
+
+    monkeypatch.setattr(runner_module, "refresh_rate_limits_from_ebay", lambda: None)
+    yield
+    database.reset_engine()
+    config_module.reload_config()
+
+
+def _fake_search(self, query, limit=50, offset=0, **kwargs):
+    """Resultats pour les cartes impaires, aucun resultat pour les paires."""
+    self._track_api_call(1)
+    if int(query.split()[0].removeprefix("Pika")) % 2 == 0:
+        return EbaySearchResult(total=0)
+    items = [
+        EbayItem(item_id=f"v1|{query}|{k}", title=query, price=1.0 + k, currency="EUR")
+        for k in range(10)
+    ]
+    return EbaySearchResult(total=len(items), items=items, offset=offset, limit=limit)
+
+
+def test_full_ebay_saves_generated_queries(db, monkeypatch):
+    """Les requetes generees pendant le batch sont ecrites, en succes comme en echec."""
+    monkeypatch.setattr(EbayClient, "search", _fake_search)
+
+    runner = runner_module.BatchRunner(track_api_usage=False)
+    try:
+        stats, _ = runner.run(mode=BatchMode.FULL_EBAY)
+    finally:
+        runner.close()
+
+    assert stats.succeeded > 0 and stats.failed > 0
+    with database.get_session() as session:
+        queries = [card.ebay_query for card in session.query(Card).order_by(Card.id)]
+    assert queries == [f"Pika{i} {i}/100" for i in range(1, 8)]